@@ -0,0 +1,96 @@
+"""
+Request micro-batching for LLM calls
+
+Concurrent callers submit items individually; items arriving within a short
+window are handed to one dispatch call together, and each caller gets back
+its own result.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent submissions into batched dispatch calls
+
+    A batch is dispatched when it reaches max_batch items or max_wait
+    seconds after its first item arrived, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        dispatch: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch: int,
+        max_wait: float
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            dispatch: Coroutine function taking a list of items and returning
+                one result per item, in the same order
+            max_batch: Maximum items per dispatch call
+            max_wait: Seconds to wait for more items after the first one
+        """
+        self._dispatch = dispatch
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Strong references so in-flight dispatches are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue one item and wait for its result
+
+        Args:
+            item: Item to include in the next batch
+
+        Returns:
+            The dispatch result for this item
+
+        Raises:
+            Exception: Whatever the dispatch call raised for its batch
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Dispatch everything pending as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """Run one dispatch call and resolve its callers' futures"""
+        try:
+            results = await self._dispatch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Dispatch returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            # A caller may have stopped waiting (e.g. its own timeout)
+            if not future.done():
+                future.set_result(result)
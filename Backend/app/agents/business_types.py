@@ -0,0 +1,84 @@
+"""
+Business type detection
+
+Maps a free-text job/business description to a Google Places type with a
+single tokenization pass and hashed keyword lookups.
+"""
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Keyword -> (priority, Places type). When a description matches several
+# types, the lowest priority wins (e.g. "shop selling coffee" -> cafe).
+_KEYWORD_MAP = {
+    'cafe': (0, 'cafe'),
+    'coffee': (0, 'cafe'),
+    'restaurant': (1, 'restaurant'),
+    'food': (1, 'restaurant'),
+    'dining': (1, 'restaurant'),
+    'retail': (2, 'store'),
+    'store': (2, 'store'),
+    'shop': (2, 'store'),
+    'salon': (3, 'beauty_salon'),
+    'barber': (3, 'beauty_salon'),
+    'beauty': (3, 'beauty_salon'),
+    'gym': (4, 'gym'),
+    'fitness': (4, 'gym'),
+    'bar': (5, 'bar'),
+    'pub': (5, 'bar'),
+    'bakery': (6, 'bakery'),
+}
+
+DEFAULT_BUSINESS_TYPE = 'establishment'
+
+_TOKEN_RE = re.compile(r"[a-z]+")
+
+
+@lru_cache(maxsize=1024)
+def _match_compound(token: str) -> Optional[Tuple[int, str]]:
+    """
+    Match a word that starts or ends with a keyword
+
+    Covers compound and derived words ("bookstore", "coffeeshop",
+    "retailer") without substring matching inside unrelated words
+    ("embarrassed" does not match "bar").
+    """
+    matches = [
+        match for keyword, match in _KEYWORD_MAP.items()
+        if token.startswith(keyword) or token.endswith(keyword)
+    ]
+    return min(matches) if matches else None
+
+
+def _match_token(token: str) -> Optional[Tuple[int, str]]:
+    """Look up one word: exact keyword, simple plural, then compound/derived form"""
+    match = _KEYWORD_MAP.get(token)
+    if match is None and token.endswith('s'):
+        # Simple plurals: "restaurants", "shops", "salons"
+        match = _KEYWORD_MAP.get(token[:-1])
+    if match is None:
+        match = _match_compound(token)
+    if match is None and token.endswith('s'):
+        match = _match_compound(token[:-1])
+    return match
+
+
+def extract_business_type(user_job: str) -> str:
+    """
+    Extract business type from job description
+
+    Args:
+        user_job: Job/business description
+
+    Returns:
+        Business type for Google Places search
+    """
+    best = None
+    for token in _TOKEN_RE.findall(user_job.lower()):
+        match = _match_token(token)
+        if match is not None and (best is None or match < best):
+            best = match
+            if best[0] == 0:
+                break
+
+    return best[1] if best else DEFAULT_BUSINESS_TYPE
@@ -3,19 +3,56 @@ Coach Agent
 
 Generates personalized recommendations and provides guidance to applicants
 """
-import json
+import asyncio
 import re
 import logging
 from typing import Dict, Any, List, Optional
 
+import orjson
 from pydantic import BaseModel, Field
+from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from app.core.cache import TTLCache, make_cache_key
+from app.agents.llm import LLM_ERRORS, ainvoke_with_retry, get_llm_semaphore
+from app.agents.json_parsing import extract_json_span
 from app.agents.coach.prompts import (
-    RECOMMENDATION_GENERATION_PROMPT,
-    COACH_Q_AND_A_PROMPT
+    RECOMMENDATION_SYSTEM_PROMPT,
+    RECOMMENDATION_INSTRUCTIONS,
+    COACH_Q_AND_A_SYSTEM_PROMPT,
+    COACH_Q_AND_A_INSTRUCTIONS,
+    get_recommendation_prompt,
+    get_recommendation_batch_prompt,
+    get_coach_answer_prompt
 )
 
+logger = logging.getLogger(__name__)
+
+# Answers are cached per (normalized question, applicant data) so repeated
+# FAQ-style questions about the same assessment skip the LLM round-trip.
+# Entries are stored serialized so callers never share mutable lists.
+_answer_cache = TTLCache(maxsize=1024, ttl=3600)
+
+# Patterns used on every request are compiled once at import time
+_QUESTION_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_SINGLE_QUOTED_KEY_RE = re.compile(r"'([^']*)'(\s*):")
+_SINGLE_QUOTED_VALUE_RE = re.compile(r":\s*'([^']*)'")
+
+# Borderline bands around the thresholds used by _get_default_recommendations.
+# Metrics inside a band are ambiguous enough to warrant the LLM; metrics
+# outside every band are fully described by the rule-based recommendations.
+_TRIVIAL_BANDS = {
+    'debt_to_income_ratio': (35.0, 45.0),
+    'savings_rate': (5.0, 15.0),
+    'viability_score': (50.0, 70.0),
+}
+_TRIVIAL_ELIGIBILITY = {'approved', 'denied'}
+
+
+def _normalize_question(question: str) -> str:
+    """Lowercase and strip punctuation/extra whitespace so trivial rewordings share a cache entry"""
+    return " ".join(_QUESTION_TOKEN_RE.findall(question.lower()))
+
 
 class CoachAgent:
     """
@@ -25,14 +62,29 @@ class CoachAgent:
     and answers user questions about their assessment.
     """
 
-    def __init__(self, llm: ChatGoogleGenerativeAI):
+    def __init__(self, llm: ChatGoogleGenerativeAI, max_concurrency: Optional[int] = None):
         """
         Initialize Coach agent
 
         Args:
             llm: Shared LLM instance
+            max_concurrency: Cap on this agent's in-flight LLM calls; defaults
+                to the process-wide limit shared with the other agents
         """
         self.llm = llm
+        self._sem = asyncio.Semaphore(max_concurrency) if max_concurrency else get_llm_semaphore()
+        # Static prompt prefixes are built once and sent ahead of the
+        # per-applicant data so Gemini can serve them from its prefix cache
+        self._rec_system_message = SystemMessage(content=RECOMMENDATION_SYSTEM_PROMPT)
+        self._qa_system_message = SystemMessage(content=COACH_Q_AND_A_SYSTEM_PROMPT)
+        # Structured output enforces the schema server-side, so those calls
+        # skip the JSON example and send only the instructions
+        self._rec_structured_system_message = SystemMessage(content=RECOMMENDATION_INSTRUCTIONS)
+        self._qa_structured_system_message = SystemMessage(content=COACH_Q_AND_A_INSTRUCTIONS)
+        # Bind the structured-output runnables once instead of per call
+        self._structured_rec_llm = llm.with_structured_output(self._RecommendationsOutput, method="json_schema")
+        self._structured_batch_llm = llm.with_structured_output(self._BatchRecommendationsOutput, method="json_schema")
+        self._structured_qa_llm = llm.with_structured_output(self._CoachAnswerOutput, method="json_schema")
 
     # ----- Structured output schema (recommended for Gemini 3) -----
 
@@ -56,6 +108,18 @@ class CoachAgent:
     class _RecommendationsOutput(BaseModel):
         recommendations: List["CoachAgent._RecommendationItem"]  # type: ignore
 
+    class _ApplicantRecommendations(BaseModel):
+        applicant_id: str
+        recommendations: List["CoachAgent._RecommendationItem"]  # type: ignore
+
+    class _BatchRecommendationsOutput(BaseModel):
+        results: List["CoachAgent._ApplicantRecommendations"]  # type: ignore
+
+    class _CoachAnswerOutput(BaseModel):
+        response: str
+        action_steps: List[str] = Field(default_factory=list)
+        expected_impact: str = ""
+
     @staticmethod
     def _normalize_llm_text(content: Any) -> str:
         """Gemini/LangChain may return content as list of blocks; normalize to string."""
@@ -93,59 +157,106 @@ class CoachAgent:
         Returns:
             List of recommendation dictionaries
         """
+        # Clear-cut cases are answered by the rule engine without an LLM call
+        if self._is_trivial(financial_data, market_data, assessment_data):
+            recommendations = self._get_default_recommendations(financial_data, market_data)
+            if recommendations:
+                return recommendations
+
+        # Format the prompt with all data (outside the try: a bad template
+        # or input is a bug, not an LLM failure)
+        prompt = get_recommendation_prompt(
+            user_job=user_job,
+            user_age=user_age,
+            loan_amount=loan_amount,
+            loan_purpose=loan_purpose,
+            financial_data=financial_data,
+            market_data=market_data,
+            assessment_data=assessment_data
+        )
+        human_message = HumanMessage(content=prompt)
+
+        # Prefer structured output (Gemini 3 supports native JSON schema)
         try:
-            # Format the prompt with all data
-            prompt = RECOMMENDATION_GENERATION_PROMPT.format(
-                user_job=user_job,
-                user_age=user_age,
-                loan_amount=loan_amount,
-                loan_purpose=loan_purpose,
-                # Financial metrics
-                monthly_income=financial_data.get('monthly_income', 0),
-                monthly_expenses=financial_data.get('monthly_expenses', 0),
-                debt_to_income_ratio=financial_data.get('debt_to_income_ratio', 0),
-                savings_rate=financial_data.get('savings_rate', 0),
-                avg_monthly_balance=financial_data.get('avg_monthly_balance', 0),
-                min_balance_6mo=financial_data.get('min_balance_6mo', 0),
-                overdraft_count=financial_data.get('overdraft_count', 0),
-                income_stability_score=financial_data.get('income_stability_score', 0),
-                # Market metrics
-                competitor_count=market_data.get('competitor_count', 0),
-                market_density=market_data.get('market_density', 'unknown'),
-                viability_score=market_data.get('viability_score', 0),
-                market_insights=market_data.get('market_insights', 'No insights available'),
-                # Assessment
-                eligibility=assessment_data.get('eligibility', 'review'),
-                risk_level=assessment_data.get('risk_level', 'medium'),
-                confidence_score=assessment_data.get('confidence_score', 0),
-                reasoning=assessment_data.get('reasoning', '')
-            )
-
-            # Prefer structured output (Gemini 3 supports native JSON schema)
-            try:
-                structured = self.llm.with_structured_output(self._RecommendationsOutput, method="json_schema")
-                out = await structured.ainvoke(prompt)
-                recs = out.model_dump().get("recommendations", []) if hasattr(out, "model_dump") else out.get("recommendations", [])
-                if isinstance(recs, list) and len(recs) > 0:
-                    return recs
-            except Exception as e:
-                logging.getLogger(__name__).warning(f"Coach structured output failed; falling back to parsing: {e}")
-
-            # Fallback: Call LLM and parse text
-            response = await self.llm.ainvoke(prompt)
+            out = await ainvoke_with_retry(self._structured_rec_llm, [self._rec_structured_system_message, human_message], self._sem)
+            recs = out.model_dump().get("recommendations", []) if hasattr(out, "model_dump") else out.get("recommendations", [])
+            if isinstance(recs, list) and len(recs) > 0:
+                return recs
+        except LLM_ERRORS as e:
+            logger.warning(f"Coach structured output failed; falling back to parsing: {e}")
+
+        # Fallback: Call LLM and parse text
+        try:
+            response = await ainvoke_with_retry(self.llm, [self._rec_system_message, human_message], self._sem)
             response_text = self._normalize_llm_text(response.content)
             recommendations = self._parse_recommendations_response(response_text)
+        except LLM_ERRORS as e:
+            logger.error(f"Error generating recommendations: {str(e)}", exc_info=True)
+            recommendations = []
 
-            # If parsing fails, return default recommendations (never empty on parse errors)
-            if not recommendations:
-                return self._get_default_recommendations(financial_data, market_data)
+        # If the call or parsing fails, return default recommendations (never empty)
+        if not recommendations:
+            return self._get_default_recommendations(financial_data, market_data)
 
-            return recommendations
+        return recommendations
 
-        except Exception as e:
-            logging.getLogger(__name__).error(f"Error generating recommendations: {str(e)}", exc_info=True)
-            # Return default recommendations on error
-            return self._get_default_recommendations(financial_data, market_data)
+    async def generate_recommendations_batch(
+        self,
+        applicants: List[Dict[str, Any]],
+        bucketed: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Generate recommendations for several applicants in a single LLM call
+
+        Packing applicants into one prompt amortizes the shared instructions
+        and the per-call round-trip when scoring a queue of applications.
+
+        Args:
+            applicants: One dict per applicant with the keyword arguments of
+                generate_recommendations; an optional 'applicant_id' key
+                identifies the applicant (defaults to its list index)
+            bucketed: Render applicants with bucketed numeric fields so
+                similar profiles share cached prompt renders
+
+        Returns:
+            List of recommendation lists, in the same order as applicants
+        """
+        if not applicants:
+            return []
+
+        applicants = [
+            {**applicant, 'applicant_id': str(applicant.get('applicant_id', index))}
+            for index, applicant in enumerate(applicants)
+        ]
+        results: Dict[str, List[Dict[str, Any]]] = {}
+
+        # Outside the try: a bad template or input is a bug, not an LLM failure
+        prompt = get_recommendation_batch_prompt(applicants, bucketed=bucketed)
+        human_message = HumanMessage(content=prompt)
+
+        try:
+            try:
+                out = await ainvoke_with_retry(self._structured_batch_llm, [self._rec_structured_system_message, human_message], self._sem)
+                entries = out.model_dump().get("results", []) if hasattr(out, "model_dump") else out.get("results", [])
+            except LLM_ERRORS as e:
+                logger.warning(f"Coach batch structured output failed; falling back to parsing: {e}")
+                response = await ainvoke_with_retry(self.llm, [self._rec_system_message, human_message], self._sem)
+                response_text = self._normalize_llm_text(response.content)
+                entries = self._parse_recommendations_response(response_text, key='results')
+
+            for entry in entries:
+                if isinstance(entry, dict) and entry.get('recommendations'):
+                    results[str(entry.get('applicant_id'))] = entry['recommendations']
+
+        except LLM_ERRORS as e:
+            logger.error(f"Error generating batch recommendations: {str(e)}", exc_info=True)
+
+        # Applicants the model skipped get the rule-based defaults
+        return [
+            results.get(applicant['applicant_id'])
+            or self._get_default_recommendations(applicant['financial_data'], applicant['market_data'])
+            for applicant in applicants
+        ]
 
     async def answer_question(
         self,
@@ -153,7 +264,8 @@ class CoachAgent:
         financial_data: Dict[str, Any],
         assessment_data: Dict[str, Any],
         user_job: str,
-        context: Dict[str, Any] = None
+        context: Dict[str, Any] = None,
+        context_json: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Answer user's question about their assessment
@@ -164,37 +276,59 @@ class CoachAgent:
             assessment_data: Risk assessor results
             user_job: Applicant's job/business
             context: Additional context
+            context_json: Context already serialized by the caller; when given,
+                context is not serialized again
 
         Returns:
             Dictionary with response, action steps, and expected impact
         """
+        if context_json is None and context:
+            context_json = orjson.dumps(context).decode()
+
+        cache_key = make_cache_key(
+            _normalize_question(question), user_job, financial_data, assessment_data, context_json
+        )
+        cached = _answer_cache.get(cache_key)
+        if cached is not None:
+            return orjson.loads(cached)
+
+        # Format the prompt
+        prompt = get_coach_answer_prompt(
+            question=question,
+            user_job=user_job,
+            financial_data=financial_data,
+            assessment_data=assessment_data,
+            context=context_json or "No additional context"
+        )
+        human_message = HumanMessage(content=prompt)
+        result = None
+
+        # Prefer structured output; fall back to parsing the text response
         try:
-            # Format the prompt
-            prompt = COACH_Q_AND_A_PROMPT.format(
-                user_job=user_job,
-                eligibility=assessment_data.get('eligibility', 'review'),
-                risk_level=assessment_data.get('risk_level', 'medium'),
-                confidence_score=assessment_data.get('confidence_score', 0),
-                monthly_income=financial_data.get('monthly_income', 0),
-                monthly_expenses=financial_data.get('monthly_expenses', 0),
-                debt_to_income_ratio=financial_data.get('debt_to_income_ratio', 0),
-                savings_rate=financial_data.get('savings_rate', 0),
-                overdraft_count=financial_data.get('overdraft_count', 0),
-                question=question,
-                context=json.dumps(context) if context else "No additional context"
-            )
-
-            # Call LLM
-            response = await self.llm.ainvoke(prompt)
-            response_text = self._normalize_llm_text(response.content)
-
-            # Parse JSON response
-            result = self._parse_coach_response(response_text)
+            out = await ainvoke_with_retry(self._structured_qa_llm, [self._qa_structured_system_message, human_message], self._sem)
+            result = out.model_dump() if hasattr(out, "model_dump") else dict(out)
+        except LLM_ERRORS as e:
+            logger.warning(f"Coach Q&A structured output failed; falling back to parsing: {e}")
 
+        try:
+            if not result or not result.get('response'):
+                response = await ainvoke_with_retry(self.llm, [self._qa_system_message, human_message], self._sem)
+                response_text = self._normalize_llm_text(response.content)
+                result = self._parse_coach_response(response_text)
+                if result is None:
+                    # Unparseable reply: answer with the raw text, but leave it
+                    # uncached so the next ask retries the LLM
+                    return {
+                        'response': response_text[:200],
+                        'action_steps': ["Review your assessment", "Focus on key metrics", "Follow recommendations"],
+                        'expected_impact': "Improvements will increase approval likelihood"
+                    }
+
+            _answer_cache.set(cache_key, orjson.dumps(result))
             return result
 
-        except Exception as e:
-            print(f"Error answering question: {str(e)}")
+        except LLM_ERRORS:
+            logger.exception("Error answering question")
             return {
                 'response': f"I understand your question about '{question}'. Based on your assessment, I recommend focusing on improving your financial metrics. Please try asking a more specific question, and I'll provide detailed guidance.",
                 'action_steps': [
@@ -205,50 +339,87 @@ class CoachAgent:
                 'expected_impact': "Focused improvements can increase approval likelihood"
             }
 
-    def _parse_recommendations_response(self, response_text: str) -> List[Dict[str, Any]]:
-        """Parse LLM response for recommendations"""
+    def _parse_recommendations_response(
+        self,
+        response_text: str,
+        key: str = 'recommendations'
+    ) -> List[Dict[str, Any]]:
+        """Parse LLM response for recommendations (or another top-level list, e.g. batch 'results')"""
         try:
             response_text = self._normalize_llm_text(response_text)
             # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-                return data.get('recommendations', [])
+            json_span = extract_json_span(response_text)
+            if json_span:
+                data = orjson.loads(json_span)
+                return data.get(key, [])
 
             # Try parsing entire response as JSON
-            data = json.loads(response_text)
-            return data.get('recommendations', [])
+            data = orjson.loads(response_text)
+            return data.get(key, [])
 
         except Exception as e:
-            logging.getLogger(__name__).warning(f"Error parsing recommendations response: {str(e)}")
+            logger.warning(f"Error parsing recommendations response: {str(e)}")
             # Try a naive single-quote fix as last resort
             try:
-                fixed = re.sub(r"'([^']*)'(\s*):", r'"\1"\2:', response_text)
-                fixed = re.sub(r":\s*'([^']*)'", r': "\1"', fixed)
-                data = json.loads(fixed)
-                return data.get("recommendations", [])
+                fixed = _SINGLE_QUOTED_KEY_RE.sub(r'"\1"\2:', response_text)
+                fixed = _SINGLE_QUOTED_VALUE_RE.sub(r': "\1"', fixed)
+                data = orjson.loads(fixed)
+                return data.get(key, [])
             except Exception:
                 return []
 
-    def _parse_coach_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse LLM response for Q&A"""
+    def _parse_coach_response(self, response_text: str) -> Optional[Dict[str, Any]]:
+        """Parse LLM response for Q&A (None if it holds no JSON answer)"""
         try:
             response_text = self._normalize_llm_text(response_text)
             # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            json_span = extract_json_span(response_text)
+            if json_span:
+                return orjson.loads(json_span)
 
             # Try parsing entire response as JSON
-            return json.loads(response_text)
+            return orjson.loads(response_text)
 
         except Exception as e:
-            print(f"Error parsing coach response: {str(e)}")
-            return {
-                'response': response_text[:200],
-                'action_steps': ["Review your assessment", "Focus on key metrics", "Follow recommendations"],
-                'expected_impact': "Improvements will increase approval likelihood"
-            }
+            logger.warning(f"Error parsing coach response: {str(e)}")
+            return None
+
+    @staticmethod
+    def _is_trivial(
+        financial_data: Dict[str, Any],
+        market_data: Dict[str, Any],
+        assessment_data: Dict[str, Any]
+    ) -> bool:
+        """
+        Check whether the rule-based recommendations fully cover this applicant
+
+        True when the decision is a clear approve/deny and every metric the
+        default rules look at sits well away from its threshold.
+
+        Args:
+            financial_data: Financial analyst results
+            market_data: Market researcher results
+            assessment_data: Risk assessor results
+
+        Returns:
+            True if the LLM can be skipped
+        """
+        if assessment_data.get('eligibility') not in _TRIVIAL_ELIGIBILITY:
+            return False
+
+        metrics = {
+            'debt_to_income_ratio': financial_data.get('debt_to_income_ratio'),
+            'savings_rate': financial_data.get('savings_rate'),
+            'viability_score': market_data.get('viability_score'),
+        }
+        for name, value in metrics.items():
+            if not isinstance(value, (int, float)):
+                return False
+            low, high = _TRIVIAL_BANDS[name]
+            if low < value < high:
+                return False
+
+        return isinstance(financial_data.get('overdraft_count'), int)
 
     def _get_default_recommendations(
         self,
@@ -1,40 +1,24 @@
 """
 Coach Agent Prompts
 
-Prompts for generating personalized recommendations and guidance
-"""
-
-RECOMMENDATION_GENERATION_PROMPT = """You are an expert financial coach helping small business owners and entrepreneurs improve their financial health.
+Prompts for generating personalized recommendations and guidance.
 
-Based on the comprehensive financial assessment below, generate 5-7 specific, actionable recommendations to help this applicant improve their financial position and increase their loan eligibility.
-
-## Applicant Profile
-- Business/Job: {user_job}
-- Age: {user_age}
-- Loan Amount Requested: ${loan_amount:,.2f}
-- Loan Purpose: {loan_purpose}
+Each prompt is split into a static system prompt (role, instructions and the
+JSON output format) and a dynamic template holding only the per-applicant
+data. The static part is sent first and never changes between calls, so
+Gemini can serve it from its prefix cache instead of re-processing it.
 
-## Financial Metrics
-- Monthly Income: ${monthly_income:,.2f}
-- Monthly Expenses: ${monthly_expenses:,.2f}
-- Debt-to-Income Ratio: {debt_to_income_ratio:.1f}%
-- Savings Rate: {savings_rate:.1f}%
-- Average Monthly Balance: ${avg_monthly_balance:,.2f}
-- Minimum Balance (6mo): ${min_balance_6mo:,.2f}
-- Overdraft Count: {overdraft_count}
-- Income Stability Score: {income_stability_score:.1f}/100
+The JSON format sections are kept separate from the instructions: when the
+schema is enforced through structured output the example is redundant and
+only the instructions are sent.
+"""
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, Any, List, Tuple
 
-## Market Analysis
-- Competitor Count: {competitor_count}
-- Market Density: {market_density}
-- Market Viability Score: {viability_score:.1f}/100
-- Market Insights: {market_insights}
+RECOMMENDATION_INSTRUCTIONS = """You are an expert financial coach helping small business owners and entrepreneurs improve their financial health.
 
-## Risk Assessment
-- Eligibility: {eligibility}
-- Risk Level: {risk_level}
-- Confidence Score: {confidence_score:.1f}%
-- Reasoning: {reasoning}
+Based on the comprehensive financial assessment provided by the user, generate 5-7 specific, actionable recommendations to help this applicant improve their financial position and increase their loan eligibility.
 
 ## Instructions
 For each recommendation, provide:
@@ -51,12 +35,14 @@ Focus on:
 - Concrete, measurable actions
 - Areas that directly impact loan approval criteria
 - Low-hanging fruit with high impact
+"""
 
+RECOMMENDATION_JSON_FORMAT = """
 Return only valid JSON with no markdown or code fences. Use exactly these keys per recommendation: priority, category, title, evidence_summary, why_matters, recommended_action, expected_impact, evidence_transactions, evidence_patterns, evidence_stats.
 
-{{
+{
   "recommendations": [
-    {{
+    {
       "priority": "HIGH",
       "category": "Cash Flow",
       "title": "Reduce Monthly Subscription Costs",
@@ -65,43 +51,59 @@ Return only valid JSON with no markdown or code fences. Use exactly these keys p
       "recommended_action": "• Audit all subscription services and cancel unused ones\\n• Consolidate redundant tools (e.g., multiple cloud storage services)\\n• Negotiate annual plans for 15-20% savings on essential subscriptions\\n• Set a target of reducing subscriptions by $200/month",
       "expected_impact": "Could improve savings rate by 5% and free up $2,400 annually for business reinvestment",
       "evidence_transactions": [
-        {{"date": "2024-01-15", "merchant": "Adobe Creative Cloud", "amount": -52.99}},
-        {{"date": "2024-01-15", "merchant": "Salesforce", "amount": -150.00}}
+        {"date": "2024-01-15", "merchant": "Adobe Creative Cloud", "amount": -52.99},
+        {"date": "2024-01-15", "merchant": "Salesforce", "amount": -150.00}
       ],
       "evidence_patterns": [
         "Multiple overlapping software subscriptions",
         "Services not used in last 90 days still being charged"
       ],
-      "evidence_stats": {{
+      "evidence_stats": {
         "total_monthly_subscriptions": 450.00,
         "percentage_of_income": 12,
         "unused_subscriptions": 3
-      }}
-    }}
+      }
+    }
   ]
-}}
+}
 """
 
+RECOMMENDATION_SYSTEM_PROMPT = RECOMMENDATION_INSTRUCTIONS + RECOMMENDATION_JSON_FORMAT
 
-COACH_Q_AND_A_PROMPT = """You are a supportive financial coach helping a small business owner understand their loan assessment and improve their financial health.
 
-## Applicant Context
+RECOMMENDATION_GENERATION_PROMPT = """## Applicant Profile
 - Business/Job: {user_job}
-- Loan Assessment: {eligibility} ({risk_level} risk)
-- Confidence Score: {confidence_score:.1f}%
+- Age: {user_age}
+- Loan Amount Requested: ${loan_amount:,.2f}
+- Loan Purpose: {loan_purpose}
 
-## Key Financial Metrics
+## Financial Metrics
 - Monthly Income: ${monthly_income:,.2f}
 - Monthly Expenses: ${monthly_expenses:,.2f}
-- DTI Ratio: {debt_to_income_ratio:.1f}%
+- Debt-to-Income Ratio: {debt_to_income_ratio:.1f}%
 - Savings Rate: {savings_rate:.1f}%
+- Average Monthly Balance: ${avg_monthly_balance:,.2f}
+- Minimum Balance (6mo): ${min_balance_6mo:,.2f}
 - Overdraft Count: {overdraft_count}
+- Income Stability Score: {income_stability_score:.1f}/100
 
-## User Question
-{question}
+## Market Analysis
+- Competitor Count: {competitor_count}
+- Market Density: {market_density}
+- Market Viability Score: {viability_score:.1f}/100
+- Market Insights: {market_insights}
 
-## Additional Context
-{context}
+## Risk Assessment
+- Eligibility: {eligibility}
+- Risk Level: {risk_level}
+- Confidence Score: {confidence_score:.1f}%
+- Reasoning: {reasoning}
+"""
+
+
+COACH_Q_AND_A_INSTRUCTIONS = """You are a supportive financial coach helping a small business owner understand their loan assessment and improve their financial health.
+
+The user message contains the applicant context, their key financial metrics, their question and any additional context.
 
 ## Instructions
 Provide a helpful, encouraging, and actionable response that:
@@ -111,9 +113,11 @@ Provide a helpful, encouraging, and actionable response that:
 4. Quantifies expected impact where possible
 5. Uses a supportive, non-judgmental tone
 6. Keeps the response under 200 words
+"""
 
+COACH_Q_AND_A_JSON_FORMAT = """
 Return ONLY valid JSON in this exact format (no markdown, no code blocks):
-{{
+{
   "response": "Your detailed response here...",
   "action_steps": [
     "Specific action step 1",
@@ -121,5 +125,204 @@ Return ONLY valid JSON in this exact format (no markdown, no code blocks):
     "Specific action step 3"
   ],
   "expected_impact": "Quantified expected outcome (e.g., 'Could improve your approval chances by 30% within 60 days')"
+}
+"""
+
+COACH_Q_AND_A_SYSTEM_PROMPT = COACH_Q_AND_A_INSTRUCTIONS + COACH_Q_AND_A_JSON_FORMAT
+
+
+COACH_Q_AND_A_PROMPT = """## Applicant Context
+- Business/Job: {user_job}
+- Loan Assessment: {eligibility} ({risk_level} risk)
+- Confidence Score: {confidence_score:.1f}%
+
+## Key Financial Metrics
+- Monthly Income: ${monthly_income:,.2f}
+- Monthly Expenses: ${monthly_expenses:,.2f}
+- DTI Ratio: {debt_to_income_ratio:.1f}%
+- Savings Rate: {savings_rate:.1f}%
+- Overdraft Count: {overdraft_count}
+
+## User Question
+{question}
+
+## Additional Context
+{context}
+"""
+
+
+# Fallback values for metrics missing from upstream agent results. Merged
+# underneath the agent dicts in a single pass instead of one dict.get() per field.
+FINANCIAL_DEFAULTS = {
+    'monthly_income': 0,
+    'monthly_expenses': 0,
+    'debt_to_income_ratio': 0,
+    'savings_rate': 0,
+    'avg_monthly_balance': 0,
+    'min_balance_6mo': 0,
+    'overdraft_count': 0,
+    'income_stability_score': 0,
+}
+
+MARKET_DEFAULTS = {
+    'competitor_count': 0,
+    'market_density': 'unknown',
+    'viability_score': 0,
+    'market_insights': 'No insights available',
+}
+
+ASSESSMENT_DEFAULTS = {
+    'eligibility': 'review',
+    'risk_level': 'medium',
+    'confidence_score': 0,
+    'reasoning': '',
+}
+
+
+# Bucket widths for bucketed prompt rendering. Applicants in the same
+# segment then render to identical prompts that are formatted only once.
+RECOMMENDATION_BUCKETS = {
+    'user_age': 5,
+    'loan_amount': 1000,
+    'monthly_income': 1000,
+    'monthly_expenses': 1000,
+    'debt_to_income_ratio': 5,
+    'savings_rate': 5,
+    'avg_monthly_balance': 1000,
+    'min_balance_6mo': 1000,
+    'income_stability_score': 5,
+    'viability_score': 5,
+    'confidence_score': 5,
+}
+
+_RECOMMENDATION_FIELDS = tuple(
+    name for _, name, _, _ in Formatter().parse(RECOMMENDATION_GENERATION_PROMPT) if name
+)
+
+
+@lru_cache(maxsize=2048)
+def _format_bucketed_recommendation_prompt(values: Tuple[Any, ...]) -> str:
+    """Render the recommendation template from field values in _RECOMMENDATION_FIELDS order"""
+    return RECOMMENDATION_GENERATION_PROMPT.format_map(dict(zip(_RECOMMENDATION_FIELDS, values)))
+
+
+def get_recommendation_prompt(
+    user_job: str,
+    user_age: int,
+    loan_amount: float,
+    loan_purpose: str,
+    financial_data: Dict[str, Any],
+    market_data: Dict[str, Any],
+    assessment_data: Dict[str, Any],
+    bucketed: bool = False
+) -> str:
+    """
+    Generate the dynamic part of the recommendation prompt
+
+    Args:
+        user_job: Applicant's job/business
+        user_age: Applicant's age
+        loan_amount: Requested loan amount
+        loan_purpose: Purpose of the loan
+        financial_data: Financial analyst results
+        market_data: Market researcher results
+        assessment_data: Risk assessor results
+        bucketed: Round numeric fields down to RECOMMENDATION_BUCKETS and
+            reuse cached renders (for portfolio runs; loses exact figures)
+
+    Returns:
+        Formatted prompt string
+    """
+    values = {
+        **FINANCIAL_DEFAULTS,
+        **financial_data,
+        **MARKET_DEFAULTS,
+        **market_data,
+        **ASSESSMENT_DEFAULTS,
+        **assessment_data,
+        'user_job': user_job,
+        'user_age': user_age,
+        'loan_amount': loan_amount,
+        'loan_purpose': loan_purpose,
+    }
+    if not bucketed:
+        return RECOMMENDATION_GENERATION_PROMPT.format_map(values)
+
+    key = []
+    for name in _RECOMMENDATION_FIELDS:
+        value = values[name]
+        width = RECOMMENDATION_BUCKETS.get(name)
+        if width and isinstance(value, (int, float)):
+            value = (value // width) * width
+        key.append(value)
+
+    try:
+        return _format_bucketed_recommendation_prompt(tuple(key))
+    except TypeError:
+        # Unhashable field value (e.g. list insights); render uncached
+        return RECOMMENDATION_GENERATION_PROMPT.format_map(dict(zip(_RECOMMENDATION_FIELDS, key)))
+
+
+def get_coach_answer_prompt(
+    question: str,
+    user_job: str,
+    financial_data: Dict[str, Any],
+    assessment_data: Dict[str, Any],
+    context: str
+) -> str:
+    """
+    Generate the dynamic part of the Q&A prompt
+
+    Args:
+        question: User's question
+        user_job: Applicant's job/business
+        financial_data: Financial analyst results
+        assessment_data: Risk assessor results
+        context: Serialized additional context
+
+    Returns:
+        Formatted prompt string
+    """
+    return COACH_Q_AND_A_PROMPT.format_map({
+        **FINANCIAL_DEFAULTS,
+        **financial_data,
+        **ASSESSMENT_DEFAULTS,
+        **assessment_data,
+        'user_job': user_job,
+        'question': question,
+        'context': context,
+    })
+
+
+RECOMMENDATION_BATCH_INSTRUCTIONS = """Generate recommendations for EACH of the {applicant_count} applicants above, independently of one another.
+
+Return only valid JSON with no markdown or code fences, wrapping each applicant's recommendations in a results list keyed by the applicant ID shown in its heading:
+{{
+  "results": [
+    {{"applicant_id": "<applicant ID>", "recommendations": [ ... ]}}
+  ]
 }}
 """
+
+
+def get_recommendation_batch_prompt(applicants: List[Dict[str, Any]], bucketed: bool = False) -> str:
+    """
+    Generate one prompt covering several applicants
+
+    Args:
+        applicants: Keyword arguments for get_recommendation_prompt, one dict
+            per applicant, each with an additional 'applicant_id' key
+        bucketed: Render each applicant with bucketed numeric fields
+
+    Returns:
+        Formatted prompt string
+    """
+    sections = []
+    for applicant in applicants:
+        fields = {k: v for k, v in applicant.items() if k != 'applicant_id'}
+        sections.append(
+            f"# Applicant {applicant['applicant_id']}\n\n" + get_recommendation_prompt(**fields, bucketed=bucketed)
+        )
+
+    sections.append(RECOMMENDATION_BATCH_INSTRUCTIONS.format(applicant_count=len(applicants)))
+    return "\n".join(sections)
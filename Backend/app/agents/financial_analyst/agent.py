@@ -3,14 +3,31 @@ Financial Analyst Agent
 
 Analyzes financial health using Plaid data and financial metrics
 """
+import asyncio
+from bisect import bisect_left, bisect_right
 from typing import Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-from app.services.plaid_service import PlaidService
+from app.services.plaid_service import get_plaid_service
 from app.services.financial_calculator import FinancialCalculator
 
 
+# Health score threshold tables: points[i] is awarded when the metric falls
+# in the i-th bin of the sorted thresholds (see _calculate_health_score)
+_DTI_THRESHOLDS = (30, 43, 50)            # dti < 30 -> 25, < 43 -> 15, < 50 -> 5
+_DTI_POINTS = (25, 15, 5, 0)
+_SAVINGS_THRESHOLDS = (5, 10, 20)         # savings > 20 -> 20, > 10 -> 15, > 5 -> 10
+_SAVINGS_POINTS = (None, 10, 15, 20)      # None: award the savings rate itself (clamped at 0)
+_BALANCE_THRESHOLDS = (1000, 5000, 10000)  # balance > 10000 -> 15, > 5000 -> 10, > 1000 -> 5
+_BALANCE_POINTS = (0, 5, 10, 15)
+_OVERDRAFT_THRESHOLDS = (0, 2)            # overdrafts == 0 -> 10, <= 2 -> 5
+_OVERDRAFT_POINTS = (10, 5, 0)
+
+# Transaction history window pulled from Plaid
+_LOOKBACK = timedelta(days=180)
+
+
 class FinancialAnalyst:
     """
     Agent responsible for financial analysis
@@ -27,7 +44,7 @@ class FinancialAnalyst:
             llm: Shared LLM instance
         """
         self.llm = llm
-        self.plaid_service = PlaidService()
+        self.plaid_service = get_plaid_service()
         self.calculator = FinancialCalculator()
 
     async def analyze(
@@ -56,17 +73,21 @@ class FinancialAnalyst:
                 raise ValueError("Plaid access token is missing - bank connection required")
 
             # Get financial data from Plaid
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=180)
-
-            transactions_result = self.plaid_service.get_transactions(
-                access_token=access_token,
-                start_date=start_date,
-                end_date=end_date
+            # Plaid takes calendar dates; use UTC so the window does not
+            # depend on the server's local timezone
+            end_date = datetime.now(timezone.utc).date()
+            start_date = end_date - _LOOKBACK
+
+            # Fetch transactions and balances concurrently
+            transactions_result, balance_data = await asyncio.gather(
+                self.plaid_service.aget_transactions(
+                    access_token=access_token,
+                    start_date=start_date,
+                    end_date=end_date
+                ),
+                self.plaid_service.aget_balance(access_token)
             )
 
-            balance_data = self.plaid_service.get_balance(access_token)
-
             # Calculate metrics
             transactions = transactions_result.get('transactions', [])
             metrics = self.calculator.calculate_all_metrics(
@@ -222,46 +243,37 @@ class FinancialAnalyst:
         Returns:
             Score from 0-100
         """
-        score = 0.0
-
+        return self._score_metrics(
+            stability=metrics.get('income_stability_score', 0),
+            dti=metrics.get('debt_to_income_ratio', 100),
+            savings=metrics.get('savings_rate', 0),
+            avg_balance=metrics.get('avg_monthly_balance', 0),
+            overdrafts=metrics.get('overdraft_count', 0)
+        )
+
+    @staticmethod
+    def _score_metrics(
+        stability: float,
+        dti: float,
+        savings: float,
+        avg_balance: float,
+        overdrafts: int
+    ) -> float:
+        """Score one applicant's metrics against the module threshold tables"""
         # Income stability (30 points)
-        stability = metrics.get('income_stability_score', 0)
-        score += (stability / 100) * 30
+        score = (stability / 100) * 30
 
         # DTI ratio (25 points)
-        dti = metrics.get('debt_to_income_ratio', 100)
-        if dti < 30:
-            score += 25
-        elif dti < 43:
-            score += 15
-        elif dti < 50:
-            score += 5
+        score += _DTI_POINTS[bisect_right(_DTI_THRESHOLDS, dti)]
 
         # Savings rate (20 points)
-        savings = metrics.get('savings_rate', 0)
-        if savings > 20:
-            score += 20
-        elif savings > 10:
-            score += 15
-        elif savings > 5:
-            score += 10
-        else:
-            score += max(0, savings)
+        savings_points = _SAVINGS_POINTS[bisect_left(_SAVINGS_THRESHOLDS, savings)]
+        score += max(0, savings) if savings_points is None else savings_points
 
         # Balance health (15 points)
-        avg_balance = metrics.get('avg_monthly_balance', 0)
-        if avg_balance > 10000:
-            score += 15
-        elif avg_balance > 5000:
-            score += 10
-        elif avg_balance > 1000:
-            score += 5
+        score += _BALANCE_POINTS[bisect_left(_BALANCE_THRESHOLDS, avg_balance)]
 
         # Overdrafts (10 points)
-        overdrafts = metrics.get('overdraft_count', 0)
-        if overdrafts == 0:
-            score += 10
-        elif overdrafts <= 2:
-            score += 5
+        score += _OVERDRAFT_POINTS[bisect_left(_OVERDRAFT_THRESHOLDS, overdrafts)]
 
         return min(100.0, max(0.0, score))
@@ -0,0 +1,83 @@
+"""
+JSON extraction helpers for LLM responses
+
+LLM replies often wrap the JSON payload in prose or markdown. These helpers
+locate the payload with a single forward scan instead of a greedy regex,
+so only the JSON object itself is handed to the JSON parser.
+"""
+import json
+import re
+from typing import Any, Iterator, Optional
+
+# Characters that affect object bounds. An escape and the character it
+# escapes match as one token, so escaped quotes never toggle string state;
+# everything else is skipped by the regex engine.
+_STRUCTURAL_RE = re.compile(r'\\.|["{}]', re.DOTALL)
+
+_DECODER = json.JSONDecoder()
+
+
+def extract_json_span(text: str, start: int = 0) -> Optional[str]:
+    """
+    Find the first balanced JSON object in text
+
+    Scans once from the first '{' at or after start, tracking brace depth
+    and skipping braces inside string literals (including escaped quotes).
+    Only structural characters are visited, so long prose or string values
+    cost no Python-level work.
+
+    Args:
+        text: Text that may contain a JSON object
+        start: Index to start searching from
+
+    Returns:
+        The substring spanning the first balanced {...} object, or None if
+        there is no opening brace or the object is never closed
+    """
+    begin = text.find('{', start)
+    if begin == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    for match in _STRUCTURAL_RE.finditer(text, begin):
+        token = match.group()
+        if token == '"':
+            in_string = not in_string
+        elif in_string or len(token) == 2:
+            continue
+        elif token == '{':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return text[begin:match.end()]
+
+    return None
+
+
+def iter_json_objects(text: str) -> Iterator[Any]:
+    """
+    Decode each JSON object that starts at an opening brace in text
+
+    Every '{' is handed to the C-accelerated JSONDecoder.raw_decode, which
+    finds the object's end and parses it in one pass; braces in prose that
+    do not start valid JSON are skipped. Objects nested inside a decoded
+    object are yielded after it, so a caller looking for a specific shape
+    also finds it inside a wrapper.
+
+    Args:
+        text: Text that may contain JSON objects
+
+    Yields:
+        Decoded objects, in order of their opening brace
+    """
+    index = text.find('{')
+    while index != -1:
+        try:
+            obj, _ = _DECODER.raw_decode(text, index)
+        except json.JSONDecodeError:
+            pass
+        else:
+            yield obj
+        index = text.find('{', index + 1)
@@ -4,13 +4,49 @@ Shared LLM instance for all agents
 This module provides a singleton LLM instance that is shared across all agents
 to improve performance and resource management.
 """
+import asyncio
+import logging
+import random
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Optional
+
+import httpx
 from langchain_google_genai import ChatGoogleGenerativeAI
 from app.core.config import get_settings
 
+try:
+    from langchain_google_genai.chat_models import ChatGoogleGenerativeAIError
+except ImportError:  # Older langchain-google-genai releases
+    ChatGoogleGenerativeAIError = None
+
+try:
+    from google.api_core.exceptions import GoogleAPIError, ResourceExhausted
+except ImportError:  # Not installed alongside newer google-genai based releases
+    GoogleAPIError = None
+    ResourceExhausted = None
+
 settings = get_settings()
 
-# Shared LLM instance
+# Errors an LLM call or response parse can raise at runtime (API failures,
+# transport errors, timeouts, malformed JSON). Agents catch only these so
+# programming errors surface instead of being masked by fallback output.
+LLM_ERRORS = tuple(
+    error for error in (ChatGoogleGenerativeAIError, GoogleAPIError)
+    if error is not None
+) + (httpx.HTTPError, TimeoutError, ConnectionError, ValueError)
+
+logger = logging.getLogger(__name__)
+
+# Shared LLM instances
 _llm_instance = None
+_fast_llm_instance = None
+
+# Process-wide cap on in-flight Gemini calls
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+# Exponential backoff between rate-limited attempts (seconds)
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 30.0
 
 
 def get_llm() -> ChatGoogleGenerativeAI:
@@ -18,23 +54,165 @@ def get_llm() -> ChatGoogleGenerativeAI:
     Get or create shared LLM instance
 
     Returns:
-        ChatGoogleGenerativeAI: Shared LLM instance configured with Gemini Pro
+        ChatGoogleGenerativeAI: Shared LLM instance configured with GEMINI_MODEL
     """
     global _llm_instance
 
     if _llm_instance is None:
         _llm_instance = ChatGoogleGenerativeAI(
-            model="gemini-3-pro-preview",
+            model=settings.GEMINI_MODEL,
             google_api_key=settings.GEMINI_API_KEY,
-            temperature=0.3
+            temperature=0.3,
+            timeout=settings.LLM_TIMEOUT_SECONDS
         )
 
     return _llm_instance
 
 
+def get_fast_llm() -> ChatGoogleGenerativeAI:
+    """
+    Get or create shared low-latency LLM instance
+
+    Used for short, schema-constrained tasks (the risk decision) where a
+    Flash-tier model's lower time-to-first-token matters more than depth.
+
+    Returns:
+        ChatGoogleGenerativeAI: Shared LLM instance configured with GEMINI_FAST_MODEL
+    """
+    global _fast_llm_instance
+
+    if _fast_llm_instance is None:
+        _fast_llm_instance = ChatGoogleGenerativeAI(
+            model=settings.GEMINI_FAST_MODEL,
+            google_api_key=settings.GEMINI_API_KEY,
+            temperature=0.3,
+            timeout=settings.LLM_TIMEOUT_SECONDS
+        )
+
+    return _fast_llm_instance
+
+
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """
+    Get or create the semaphore shared by all agents' LLM calls
+
+    Returns:
+        asyncio.Semaphore: Semaphore sized by LLM_MAX_CONCURRENCY
+    """
+    global _llm_semaphore
+
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+
+    return _llm_semaphore
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Check whether an LLM error is a quota/rate-limit rejection (HTTP 429)
+
+    Args:
+        error: Exception raised by an LLM call
+
+    Returns:
+        True if the call should be retried after a backoff
+    """
+    if ResourceExhausted is not None and isinstance(error, ResourceExhausted):
+        return True
+    if getattr(error, 'code', None) == 429 or getattr(error, 'status_code', None) == 429:
+        return True
+    # The LangChain wrapper only keeps the upstream error in its message
+    message = str(error)
+    return '429' in message or 'RESOURCE_EXHAUSTED' in message
+
+
+async def ainvoke_with_retry(
+    runnable: Any,
+    messages: Any,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    max_attempts: Optional[int] = None
+) -> Any:
+    """
+    Invoke an LLM runnable under the concurrency cap, retrying rate limits
+
+    Rate-limited calls are retried with jittered exponential backoff; the
+    semaphore is released while waiting so other calls can proceed. Any
+    other error is raised immediately.
+
+    Args:
+        runnable: LLM or structured-output runnable exposing ainvoke
+        messages: Input passed to ainvoke
+        semaphore: Concurrency limiter (defaults to the shared one)
+        max_attempts: Attempts before giving up (defaults to LLM_MAX_RETRIES)
+
+    Returns:
+        The runnable's result
+    """
+    semaphore = semaphore or get_llm_semaphore()
+    max_attempts = max_attempts or settings.LLM_MAX_RETRIES
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            async with semaphore:
+                return await runnable.ainvoke(messages)
+        except Exception as e:
+            if attempt == max_attempts or not is_rate_limit_error(e):
+                raise
+            delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            delay *= random.uniform(0.5, 1.0)
+            logger.warning(f"LLM rate limited (attempt {attempt}/{max_attempts}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+async def astream_with_retry(
+    runnable: Any,
+    messages: Any,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    max_attempts: Optional[int] = None
+) -> AsyncIterator[Any]:
+    """
+    Stream an LLM runnable under the concurrency cap, retrying rate limits
+
+    Like ainvoke_with_retry, but a rate-limited call is only retried if it
+    failed before its first chunk; errors mid-stream are raised as-is. The
+    semaphore is held while chunks are read. Consume it inside
+    contextlib.aclosing so stopping early closes the upstream stream.
+
+    Args:
+        runnable: LLM runnable exposing astream
+        messages: Input passed to astream
+        semaphore: Concurrency limiter (defaults to the shared one)
+        max_attempts: Attempts before giving up (defaults to LLM_MAX_RETRIES)
+
+    Yields:
+        The runnable's chunks
+    """
+    semaphore = semaphore or get_llm_semaphore()
+    max_attempts = max_attempts or settings.LLM_MAX_RETRIES
+
+    for attempt in range(1, max_attempts + 1):
+        started = False
+        try:
+            async with semaphore:
+                async with aclosing(runnable.astream(messages)) as stream:
+                    async for chunk in stream:
+                        started = True
+                        yield chunk
+            return
+        except Exception as e:
+            if started or attempt == max_attempts or not is_rate_limit_error(e):
+                raise
+            delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            delay *= random.uniform(0.5, 1.0)
+            logger.warning(f"LLM stream rate limited (attempt {attempt}/{max_attempts}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
 def reset_llm():
     """
-    Reset LLM instance (useful for testing)
+    Reset LLM instances and concurrency limiter (useful for testing)
     """
-    global _llm_instance
+    global _llm_instance, _fast_llm_instance, _llm_semaphore
     _llm_instance = None
+    _fast_llm_instance = None
+    _llm_semaphore = None
@@ -3,10 +3,13 @@ Market Researcher Agent
 
 Analyzes market conditions and competition using Google Maps/Places data
 """
-from typing import Dict, Any, List
+import heapq
+from operator import itemgetter
+from typing import Dict, Any, List, Optional
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-from app.services.google_service import GoogleService
+from app.services.google_service import get_google_service
+from app.agents.business_types import extract_business_type
 
 
 class MarketResearcher:
@@ -25,7 +28,7 @@ class MarketResearcher:
             llm: Shared LLM instance
         """
         self.llm = llm
-        self.google_service = GoogleService()
+        self.google_service = get_google_service()
 
     async def analyze(
         self,
@@ -53,7 +56,7 @@ class MarketResearcher:
             business_type = self._extract_business_type(user_job)
 
             # Search for nearby competing businesses
-            nearby = self.google_service.get_nearby_businesses(
+            nearby = await self.google_service.aget_nearby_businesses(
                 lat=location_lat,
                 lng=location_lng,
                 business_type=business_type,
@@ -66,11 +69,19 @@ class MarketResearcher:
                 radius_miles=2.0
             )
 
+            # Places returns results by prominence, not distance, so pick the
+            # closest competitors explicitly; aggregates use the full list
+            closest = heapq.nsmallest(10, nearby, key=itemgetter('distance_miles'))
+
+            # Competitor rating statistics, shared by scoring and insights
+            rating_stats = self._rating_stats(nearby)
+
             # Calculate viability score
             viability_score = self._calculate_viability_score(
                 nearby_businesses=nearby,
                 density=density,
-                business_type=business_type
+                business_type=business_type,
+                rating_stats=rating_stats
             )
 
             # Generate insights
@@ -78,7 +89,8 @@ class MarketResearcher:
                 nearby_businesses=nearby,
                 density=density,
                 business_type=business_type,
-                user_job=user_job
+                user_job=user_job,
+                rating_stats=rating_stats
             )
 
             return {
@@ -86,7 +98,7 @@ class MarketResearcher:
                 'competitor_count': len(nearby),
                 'market_density': density,
                 'viability_score': viability_score,
-                'nearby_businesses': nearby[:10],  # Top 10 closest
+                'nearby_businesses': closest,  # Top 10 closest
                 'market_insights': insights['summary'],
                 'opportunities': insights['opportunities'],
                 'risks': insights['risks'],
@@ -122,31 +134,47 @@ class MarketResearcher:
         Returns:
             Business type for Google Places search
         """
-        job_lower = user_job.lower()
-
-        # Keyword matching for common business types
-        if 'cafe' in job_lower or 'coffee' in job_lower:
-            return 'cafe'
-        elif 'restaurant' in job_lower or 'food' in job_lower or 'dining' in job_lower:
-            return 'restaurant'
-        elif 'retail' in job_lower or 'store' in job_lower or 'shop' in job_lower:
-            return 'store'
-        elif 'salon' in job_lower or 'barber' in job_lower or 'beauty' in job_lower:
-            return 'beauty_salon'
-        elif 'gym' in job_lower or 'fitness' in job_lower:
-            return 'gym'
-        elif 'bar' in job_lower or 'pub' in job_lower:
-            return 'bar'
-        elif 'bakery' in job_lower:
-            return 'bakery'
-        else:
-            return 'establishment'
+        return extract_business_type(user_job)
+
+    @staticmethod
+    def _rating_stats(nearby_businesses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Summarize competitor ratings in a single pass
+
+        Args:
+            nearby_businesses: List of competing businesses
+
+        Returns:
+            Dictionary with avg_rating (0.0 if no ratings), low_rated_count
+            (rating < 3.5) and high_rated_count (rating >= 4.5)
+        """
+        total = 0.0
+        rated = 0
+        low = 0
+        high = 0
+        for business in nearby_businesses:
+            rating = business.get("rating")
+            if rating is None:
+                continue
+            total += rating
+            rated += 1
+            if rating < 3.5:
+                low += 1
+            elif rating >= 4.5:
+                high += 1
+
+        return {
+            'avg_rating': total / rated if rated else 0.0,
+            'low_rated_count': low,
+            'high_rated_count': high
+        }
 
     def _calculate_viability_score(
         self,
         nearby_businesses: List[Dict[str, Any]],
         density: str,
-        business_type: str
+        business_type: str,
+        rating_stats: Optional[Dict[str, Any]] = None
     ) -> float:
         """
         Calculate market viability score (0-100)
@@ -155,6 +183,7 @@ class MarketResearcher:
             nearby_businesses: List of competing businesses
             density: Market density classification
             business_type: Type of business
+            rating_stats: Precomputed _rating_stats (computed if omitted)
 
         Returns:
             Viability score from 0-100
@@ -184,8 +213,7 @@ class MarketResearcher:
 
         # Competitor quality impact (based on ratings)
         if nearby_businesses:
-            ratings = [b.get("rating") for b in nearby_businesses if b.get("rating") is not None]
-            avg_rating = (sum(ratings) / len(ratings)) if ratings else 0.0
+            avg_rating = (rating_stats or self._rating_stats(nearby_businesses))['avg_rating']
             if avg_rating >= 4.5:
                 quality_penalty = -10.0
             elif avg_rating >= 4.0:
@@ -204,7 +232,8 @@ class MarketResearcher:
         nearby_businesses: List[Dict[str, Any]],
         density: str,
         business_type: str,
-        user_job: str
+        user_job: str,
+        rating_stats: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Generate market insights, opportunities, and risks
@@ -214,11 +243,14 @@ class MarketResearcher:
             density: Market density classification
             business_type: Type of business
             user_job: Applicant's job description
+            rating_stats: Precomputed _rating_stats (computed if omitted)
 
         Returns:
             Dictionary with insights, opportunities, and risks
         """
         competitor_count = len(nearby_businesses)
+        if rating_stats is None:
+            rating_stats = self._rating_stats(nearby_businesses)
 
         # Summary
         summary = (
@@ -240,14 +272,9 @@ class MarketResearcher:
             opportunities.append("Limited competition allows for market share capture")
 
         # Check for low-rated competitors
-        if nearby_businesses:
-            low_rated = [
-                b
-                for b in nearby_businesses
-                if (b.get("rating") is not None and b.get("rating") < 3.5)
-            ]
-            if low_rated:
-                opportunities.append(f"{len(low_rated)} competitors have low ratings - quality differentiation opportunity")
+        low_rated = rating_stats['low_rated_count']
+        if low_rated:
+            opportunities.append(f"{low_rated} competitors have low ratings - quality differentiation opportunity")
 
         # Risks
         risks = []
@@ -259,14 +286,9 @@ class MarketResearcher:
             risks.append(f"{competitor_count} competitors in area indicates saturated market")
 
         # Check for highly-rated competitors
-        if nearby_businesses:
-            high_rated = [
-                b
-                for b in nearby_businesses
-                if (b.get("rating") is not None and b.get("rating") >= 4.5)
-            ]
-            if high_rated:
-                risks.append(f"{len(high_rated)} competitors have high ratings (4.5+) - strong competition")
+        high_rated = rating_stats['high_rated_count']
+        if high_rated:
+            risks.append(f"{high_rated} competitors have high ratings (4.5+) - strong competition")
 
         if not opportunities:
             opportunities.append("Market conditions are competitive but manageable")
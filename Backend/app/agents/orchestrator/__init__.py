@@ -1,6 +1,6 @@
 """
 Orchestrator module
 """
-from .orchestrator import Orchestrator
+from .orchestrator import Orchestrator, get_orchestrator
 
-__all__ = ['Orchestrator']
+__all__ = ['Orchestrator', 'get_orchestrator']
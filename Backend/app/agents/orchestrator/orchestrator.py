@@ -12,14 +12,53 @@ for optimal performance, then passes results to Risk Assessor for final decision
 and finally generates recommendations via Coach agent.
 """
 import asyncio
-from typing import Dict, Any, Optional
-from datetime import datetime
+import time
+from types import MappingProxyType
+from typing import Dict, Any, AsyncIterator, List, Optional
+from datetime import datetime, timezone
 
-from app.agents.llm import get_llm
+from app.agents.llm import get_llm, get_fast_llm
 from app.agents.financial_analyst import FinancialAnalyst
 from app.agents.market_researcher import MarketResearcher
 from app.agents.risk_assessor import RiskAssessor
 from app.agents.coach import CoachAgent
+from app.core.cache import make_cache_key
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Reasoning-log entries are returned to the client and persisted with the
+# assessment; long upstream error texts are truncated to keep them bounded
+_MAX_LOG_MESSAGE_CHARS = 500
+
+# Immutable skeletons of the fallback results. Lists and nested dicts are
+# built per call so callers can still mutate what they get back.
+_DEFAULT_FINANCIAL_RESULTS = MappingProxyType({
+    'success': False,
+    'monthly_income': 0.0,
+    'monthly_expenses': 0.0,
+    'debt_to_income_ratio': 0.0,
+    'savings_rate': 0.0,
+    'avg_monthly_balance': 0.0,
+    'min_balance_6mo': 0.0,
+    'overdraft_count': 0,
+    'income_stability_score': 0.0,
+    'financial_health_score': 0.0,
+})
+
+_DEFAULT_MARKET_RESULTS = MappingProxyType({
+    'success': False,
+    'competitor_count': 0,
+    'market_density': 'medium',
+    'viability_score': 50.0,
+})
+
+_DEFAULT_RISK_RESULTS = MappingProxyType({
+    'success': False,
+    'eligibility': 'review',
+    'confidence_score': 0.0,
+    'risk_level': 'high',
+})
 
 
 class Orchestrator:
@@ -40,9 +79,12 @@ class Orchestrator:
         # Initialize all agents with shared LLM
         self.financial_analyst = FinancialAnalyst(llm)
         self.market_researcher = MarketResearcher(llm)
-        self.risk_assessor = RiskAssessor(llm)
+        self.risk_assessor = RiskAssessor(get_fast_llm())
         self.coach = CoachAgent(llm)
 
+        # Identical assessments in flight, keyed on a hash of their inputs
+        self._inflight: Dict[str, asyncio.Task] = {}
+
     async def run_assessment(
         self,
         application_id: str,
@@ -60,7 +102,8 @@ class Orchestrator:
         This method orchestrates the entire loan assessment process:
         1. Runs Financial Analyst and Market Researcher in parallel
         2. Passes results to Risk Assessor for final decision
-        3. Aggregates all results into comprehensive assessment
+        3. Generates recommendations via Coach agent
+        4. Aggregates all results into comprehensive assessment
 
         Args:
             application_id: Unique application identifier
@@ -77,13 +120,95 @@ class Orchestrator:
             - financial_metrics: Financial analysis results
             - market_analysis: Market research results
             - final_assessment: Risk assessment and decision
+            - recommendations: Coach recommendations
             - metadata: Processing information
         """
-        start_time = datetime.now()
+        arguments = {
+            'application_id': application_id,
+            'access_token': access_token,
+            'user_job': user_job,
+            'user_age': user_age,
+            'location_lat': location_lat,
+            'location_lng': location_lng,
+            'loan_amount': loan_amount,
+            'loan_purpose': loan_purpose
+        }
+
+        # Concurrent identical requests (double submits, retries) share one
+        # pipeline run instead of each calling Plaid, Places and Gemini
+        key = make_cache_key(arguments)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._collect_assessment(arguments))
+            self._inflight[key] = task
+            task.add_done_callback(
+                lambda done: self._inflight.pop(key) if self._inflight.get(key) is done else None
+            )
+
+        # Shielded so one caller giving up does not cancel the others' run
+        return await asyncio.shield(task)
+
+    async def _collect_assessment(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the streaming workflow to completion and return the aggregate result
+
+        Args:
+            arguments: Keyword arguments of run_assessment
+
+        Returns:
+            The run_assessment result
+        """
+        result: Dict[str, Any] = {}
+        async for event in self.run_assessment_streaming(**arguments):
+            if event['event'] == 'assessment':
+                # Updated in place with recommendations and final timing
+                result = event['data']
+        return result
+
+    async def run_assessment_streaming(
+        self,
+        application_id: str,
+        access_token: str,
+        user_job: str,
+        user_age: int,
+        location_lat: float,
+        location_lng: float,
+        loan_amount: float,
+        loan_purpose: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute the assessment workflow, emitting the decision before recommendations
+
+        Coach runs as a background task started as soon as the risk decision
+        is available, so the decision can be shown while recommendations are
+        still being generated.
+
+        Args:
+            application_id: Unique application identifier
+            access_token: Decrypted Plaid access token
+            user_job: Applicant's job/business
+            user_age: Applicant's age
+            location_lat: Business location latitude
+            location_lng: Business location longitude
+            loan_amount: Requested loan amount
+            loan_purpose: Purpose of the loan
+
+        Yields:
+            {'event': 'assessment', 'data': ...}: The run_assessment result
+                with empty recommendations, as soon as the decision is made
+            {'event': 'recommendations', 'data': [...]}: Coach
+                recommendations. The assessment payload is updated in place
+                with them and with the final timing before this is yielded.
+        """
+        # Wall clock for the reported timestamps, monotonic clock for the duration
+        start_time = datetime.now(timezone.utc)
+        start_perf = time.perf_counter()
         messages = []
         reasoning_log = []
 
         def _log(agent: str, message: str, severity: str = "info") -> None:
+            if len(message) > _MAX_LOG_MESSAGE_CHARS:
+                message = message[:_MAX_LOG_MESSAGE_CHARS] + "..."
             messages.append(message)
             reasoning_log.append({
                 "agent": agent,
@@ -92,90 +217,111 @@ class Orchestrator:
                 "severity": severity,
             })
 
+        async def _run_analysis(agent: str, label: str, coro, timeout: float, default) -> Dict[str, Any]:
+            try:
+                results = await asyncio.wait_for(coro, timeout=timeout)
+            except Exception as e:
+                # TimeoutError from wait_for has an empty message
+                error = str(e) or type(e).__name__
+                _log(agent, f"{label} analysis error: {error}", "error")
+                return default(error)
+            _log(agent, f"{label} analysis completed", "success")
+            return results
+
+        async def _recommend(financial_results, market_results, risk_results) -> List[Dict[str, Any]]:
+            try:
+                recommendations = await asyncio.wait_for(
+                    self.coach.generate_recommendations(
+                        financial_data=financial_results,
+                        market_data=market_results,
+                        assessment_data=risk_results,
+                        user_job=user_job,
+                        user_age=user_age,
+                        loan_amount=loan_amount,
+                        loan_purpose=loan_purpose
+                    ),
+                    timeout=settings.COACH_AGENT_TIMEOUT_SECONDS
+                )
+                _log("Coach", f"Generated {len(recommendations)} recommendations", "success")
+                return recommendations
+            except Exception as e:
+                _log("Coach", f"Recommendation generation error: {str(e)}", "error")
+                return []
+
+        coach_task = None
         try:
             # Phase 1: Run Financial Analyst and Market Researcher in PARALLEL
             _log("Orchestrator", "Starting parallel analysis (Financial + Market)")
 
-            financial_task = self.financial_analyst.analyze(
-                access_token=access_token,
-                user_job=user_job,
-                user_age=user_age,
-                loan_amount=loan_amount,
-                loan_purpose=loan_purpose
-            )
-
-            market_task = self.market_researcher.analyze(
-                user_job=user_job,
-                location_lat=location_lat,
-                location_lng=location_lng,
-                loan_amount=loan_amount,
-                loan_purpose=loan_purpose
-            )
-
-            # Execute both agents in parallel
-            financial_results, market_results = await asyncio.gather(
-                financial_task,
-                market_task,
-                return_exceptions=True
-            )
-
-            # Handle exceptions from parallel execution
-            if isinstance(financial_results, Exception):
-                _log("FinancialAnalyst", f"Financial analysis error: {str(financial_results)}", "error")
-                financial_results = self._get_default_financial_results(str(financial_results))
-            else:
-                _log("FinancialAnalyst", "Financial analysis completed", "success")
-
-            if isinstance(market_results, Exception):
-                _log("MarketResearcher", f"Market analysis error: {str(market_results)}", "error")
-                market_results = self._get_default_market_results(str(market_results))
-            else:
-                _log("MarketResearcher", "Market analysis completed", "success")
+            # Each agent is time-boxed and substitutes its own default result on
+            # failure, so one agent erroring never cancels the other
+            async with asyncio.TaskGroup() as tg:
+                financial_task = tg.create_task(_run_analysis(
+                    "FinancialAnalyst",
+                    "Financial",
+                    self.financial_analyst.analyze(
+                        access_token=access_token,
+                        user_job=user_job,
+                        user_age=user_age,
+                        loan_amount=loan_amount,
+                        loan_purpose=loan_purpose
+                    ),
+                    settings.FINANCIAL_AGENT_TIMEOUT_SECONDS,
+                    self._get_default_financial_results
+                ))
+                market_task = tg.create_task(_run_analysis(
+                    "MarketResearcher",
+                    "Market",
+                    self.market_researcher.analyze(
+                        user_job=user_job,
+                        location_lat=location_lat,
+                        location_lng=location_lng,
+                        loan_amount=loan_amount,
+                        loan_purpose=loan_purpose
+                    ),
+                    settings.MARKET_AGENT_TIMEOUT_SECONDS,
+                    self._get_default_market_results
+                ))
+
+            financial_results = financial_task.result()
+            market_results = market_task.result()
 
             # Phase 2: Run Risk Assessor with results from both agents
             _log("RiskAssessor", "Starting risk assessment")
 
-            risk_results = await self.risk_assessor.assess(
-                user_job=user_job,
-                user_age=user_age,
-                loan_amount=loan_amount,
-                loan_purpose=loan_purpose,
-                financial_analysis=financial_results,
-                market_analysis=market_results
-            )
-
-            _log("RiskAssessor", "Risk assessment completed", "success")
+            try:
+                risk_results = await asyncio.wait_for(
+                    self.risk_assessor.assess(
+                        user_job=user_job,
+                        user_age=user_age,
+                        loan_amount=loan_amount,
+                        loan_purpose=loan_purpose,
+                        financial_analysis=financial_results,
+                        market_analysis=market_results
+                    ),
+                    timeout=settings.RISK_AGENT_TIMEOUT_SECONDS
+                )
+                _log("RiskAssessor", "Risk assessment completed", "success")
+            except asyncio.TimeoutError:
+                error = f"timed out after {settings.RISK_AGENT_TIMEOUT_SECONDS}s"
+                _log("RiskAssessor", f"Risk assessment error: {error}", "error")
+                risk_results = self._get_default_risk_results(error)
 
-            # Phase 3: Generate Recommendations via Coach Agent
+            # Phase 3: Generate Recommendations via Coach Agent in the background
             _log("Coach", "Generating personalized recommendations")
 
-            try:
-                recommendations = await self.coach.generate_recommendations(
-                    financial_data=financial_results,
-                    market_data=market_results,
-                    assessment_data=risk_results,
-                    user_job=user_job,
-                    user_age=user_age,
-                    loan_amount=loan_amount,
-                    loan_purpose=loan_purpose
-                )
-                _log("Coach", f"Generated {len(recommendations)} recommendations", "success")
-            except Exception as e:
-                _log("Coach", f"Recommendation generation error: {str(e)}", "error")
-                recommendations = []
+            coach_task = asyncio.create_task(_recommend(financial_results, market_results, risk_results))
 
-            # Calculate processing time
-            end_time = datetime.now()
-            processing_time = (end_time - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_perf
+            end_time = datetime.now(timezone.utc)
 
-            # Aggregate results
-            return {
+            result = {
                 'success': True,
                 'application_id': application_id,
                 'financial_metrics': financial_results,
                 'market_analysis': market_results,
                 'final_assessment': risk_results,
-                'recommendations': recommendations,
+                'recommendations': [],
                 'reasoning_log': reasoning_log,
                 'metadata': {
                     'processing_time_seconds': processing_time,
@@ -189,12 +335,15 @@ class Orchestrator:
 
         except Exception as e:
             # Handle orchestration-level errors
-            end_time = datetime.now()
-            processing_time = (end_time - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_perf
+            end_time = datetime.now(timezone.utc)
 
             _log("Orchestrator", f"Orchestration error: {str(e)}", "error")
 
-            return {
+            if coach_task is not None:
+                coach_task.cancel()
+                coach_task = None
+            result = {
                 'success': False,
                 'application_id': application_id,
                 'error': str(e),
@@ -213,6 +362,55 @@ class Orchestrator:
                 }
             }
 
+        try:
+            yield {'event': 'assessment', 'data': result}
+
+            if coach_task is None:
+                yield {'event': 'recommendations', 'data': []}
+                return
+
+            recommendations = await coach_task
+
+            result['recommendations'] = recommendations
+            result['metadata']['processing_time_seconds'] = time.perf_counter() - start_perf
+            result['metadata']['end_time'] = datetime.now(timezone.utc).isoformat()
+
+            yield {'event': 'recommendations', 'data': recommendations}
+        finally:
+            # Consumer stopped early (at either yield): don't leave the Coach
+            # call running. No-op once the task has finished.
+            if coach_task is not None:
+                coach_task.cancel()
+
+    async def run_assessments(
+        self,
+        applications: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute the assessment workflow for several applications concurrently
+
+        Plaid, Places and LLM round-trips overlap across applications, so a
+        batch takes roughly as long as its slowest applications rather than
+        the sum of all of them.
+
+        Args:
+            applications: One dict per application with the keyword
+                arguments of run_assessment
+            max_concurrency: Maximum assessments in flight at once
+                (defaults to LLM_MAX_CONCURRENCY)
+
+        Returns:
+            Assessment results, in the same order as applications
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.LLM_MAX_CONCURRENCY)
+
+        async def _run(application: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.run_assessment(**application)
+
+        return await asyncio.gather(*(_run(application) for application in applications))
+
     def _get_default_financial_results(self, error: str) -> Dict[str, Any]:
         """
         Get default financial results on error
@@ -224,17 +422,8 @@ class Orchestrator:
             Default financial analysis dictionary
         """
         return {
-            'success': False,
+            **_DEFAULT_FINANCIAL_RESULTS,
             'error': error,
-            'monthly_income': 0.0,
-            'monthly_expenses': 0.0,
-            'debt_to_income_ratio': 0.0,
-            'savings_rate': 0.0,
-            'avg_monthly_balance': 0.0,
-            'min_balance_6mo': 0.0,
-            'overdraft_count': 0,
-            'income_stability_score': 0.0,
-            'financial_health_score': 0.0,
             'key_findings': [f'Error in financial analysis: {error}'],
             'concerns': ['Unable to retrieve financial data'],
             'strengths': []
@@ -251,11 +440,8 @@ class Orchestrator:
             Default market analysis dictionary
         """
         return {
-            'success': False,
+            **_DEFAULT_MARKET_RESULTS,
             'error': error,
-            'competitor_count': 0,
-            'market_density': 'medium',
-            'viability_score': 50.0,
             'nearby_businesses': [],
             'market_insights': f'Error in market analysis: {error}',
             'opportunities': [],
@@ -274,11 +460,8 @@ class Orchestrator:
             Default risk assessment dictionary
         """
         return {
-            'success': False,
+            **_DEFAULT_RISK_RESULTS,
             'error': error,
-            'eligibility': 'review',
-            'confidence_score': 0.0,
-            'risk_level': 'high',
             'reasoning': f'System error during assessment: {error}',
             'recommendations': ['Manual review required due to system error'],
             'key_factors': {
@@ -287,3 +470,23 @@ class Orchestrator:
                 'overall_score': 0.0
             }
         }
+
+
+# Shared orchestrator: the agents hold no per-assessment state, so one set
+# is built per process instead of per request
+_orchestrator_instance = None
+
+
+def get_orchestrator() -> Orchestrator:
+    """
+    Get or create shared Orchestrator instance
+
+    Returns:
+        Orchestrator: Shared orchestrator with all agents initialized
+    """
+    global _orchestrator_instance
+
+    if _orchestrator_instance is None:
+        _orchestrator_instance = Orchestrator()
+
+    return _orchestrator_instance
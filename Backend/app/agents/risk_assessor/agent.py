@@ -3,17 +3,52 @@ Risk Assessor Agent
 
 Synthesizes financial and market data to make final loan decisions
 """
-from typing import Dict, Any, Optional, List
-import json
-import re
+from typing import Dict, Any, Optional, List, Literal
+import asyncio
 import logging
-from pydantic import BaseModel, Field
+from contextlib import aclosing
+from types import MappingProxyType
+import orjson
+from pydantic import BaseModel, Field, ValidationError
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-from .prompts import get_assessment_prompt, SYSTEM_PROMPT
+from app.agents.batching import MicroBatcher
+from app.agents.json_parsing import iter_json_objects
+from app.agents.llm import ainvoke_with_retry, astream_with_retry
+from app.core.config import get_settings
+from app.core.cache import TTLCache, make_cache_key
+from .prompts import get_assessment_prompt, get_assessment_batch_prompt, ASSESSMENT_SYSTEM_PROMPT
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Structured assessments keyed by (model, temperature, rendered prompt), so
+# retries and replays of an identical application skip the Gemini call.
+# Stored serialized because validation mutates the assessment dict.
+_assessment_cache = TTLCache(maxsize=512, ttl=settings.LLM_RESPONSE_CACHE_TTL_SECONDS)
+
+# Static instructions shared by every assessment call; built once and sent
+# ahead of the per-application data
+_SYSTEM_MESSAGE = SystemMessage(content=ASSESSMENT_SYSTEM_PROMPT)
+
+# Scalar fields of the safe default returned when an assessment fails;
+# mutable fields are built fresh per failure
+_FAILED_ASSESSMENT = MappingProxyType({
+    'success': False,
+    'eligibility': 'review',
+    'confidence_score': 0.0,
+    'risk_level': 'high',
+})
+
+# Financial metrics read by the business rules, in unpacking order
+_FINANCIAL_RULE_METRICS = (
+    'debt_to_income_ratio',
+    'income_stability_score',
+    'overdraft_count',
+    'financial_health_score',
+)
+
 
 class KeyFactors(BaseModel):
     """Key factors in the assessment"""
@@ -24,14 +59,24 @@ class KeyFactors(BaseModel):
 
 class AssessmentOutput(BaseModel):
     """Structured output schema for risk assessment"""
-    eligibility: str = Field(description="One of: approved, denied, review")
+    eligibility: Literal['approved', 'denied', 'review'] = Field(description="Loan decision")
     confidence_score: float = Field(ge=0, le=100, description="Confidence score 0-100")
-    risk_level: str = Field(description="One of: low, medium, high")
+    risk_level: Literal['low', 'medium', 'high'] = Field(description="Risk level")
     reasoning: str = Field(description="Detailed 2-3 sentence explanation of decision")
     recommendations: List[str] = Field(description="List of specific recommendations")
     key_factors: KeyFactors
 
 
+class BatchAssessmentEntry(AssessmentOutput):
+    """One application's assessment within a combined response"""
+    application_id: str = Field(description="Application ID from the section heading")
+
+
+class AssessmentBatchOutput(BaseModel):
+    """Structured output schema for a combined multi-application assessment"""
+    results: List[BatchAssessmentEntry]
+
+
 class RiskAssessor:
     """
     Agent responsible for final risk assessment and loan decision
@@ -48,6 +93,19 @@ class RiskAssessor:
             llm: Shared LLM instance
         """
         self.llm = llm
+        # Structured-output runnables are bound once; building them converts
+        # the Pydantic schema to JSON Schema on every call otherwise
+        self._structured_llm = llm.with_structured_output(AssessmentOutput, method="json_schema")
+        self._structured_batch_llm = llm.with_structured_output(AssessmentBatchOutput, method="json_schema")
+        # Concurrent assess() calls are coalesced into combined prompts when
+        # batching is enabled (RISK_BATCH_MAX_SIZE > 1)
+        self._batcher = None
+        if settings.RISK_BATCH_MAX_SIZE > 1:
+            self._batcher = MicroBatcher(
+                self.assess_combined,
+                max_batch=settings.RISK_BATCH_MAX_SIZE,
+                max_wait=settings.RISK_BATCH_MAX_WAIT_MS / 1000
+            )
 
     async def assess(
         self,
@@ -72,46 +130,171 @@ class RiskAssessor:
         Returns:
             Dictionary with final assessment and decision
         """
+        application = {
+            'user_job': user_job,
+            'user_age': user_age,
+            'loan_amount': loan_amount,
+            'loan_purpose': loan_purpose,
+            'financial_analysis': financial_analysis,
+            'market_analysis': market_analysis
+        }
+        if self._batcher is not None:
+            return await self._batcher.submit(application)
+
+        results = await self.assess_many([application])
+        return results[0]
+
+    async def assess_combined(self, applications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Assess several applications with a single combined prompt
+
+        The task instructions are sent once for the whole batch instead of
+        once per application. Applications missing from the combined
+        response, or all of them if the combined call fails, are assessed
+        individually through assess_many.
+
+        Args:
+            applications: One dict per application with the keyword
+                arguments of assess
+
+        Returns:
+            Assessment dictionaries, in the same order as applications
+        """
+        if len(applications) < 2:
+            return await self.assess_many(applications)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(applications)
         try:
-            # Build prompt with all data
-            prompt = get_assessment_prompt(
-                user_job=user_job,
-                user_age=user_age,
-                loan_amount=loan_amount,
-                loan_purpose=loan_purpose,
-                financial_analysis=financial_analysis,
-                market_analysis=market_analysis
-            )
+            prompt = get_assessment_batch_prompt([
+                {**application, 'application_id': str(index)}
+                for index, application in enumerate(applications)
+            ])
+            output = await ainvoke_with_retry(self._structured_batch_llm, [_SYSTEM_MESSAGE, HumanMessage(content=prompt)])
+
+            for entry in output.results:
+                index = int(entry.application_id) if entry.application_id.isdigit() else -1
+                if not 0 <= index < len(applications) or results[index] is not None:
+                    continue
+                application = applications[index]
+                assessment = self._finalize_assessment(
+                    entry.model_dump(exclude={'application_id'}),
+                    application['financial_analysis'],
+                    application['market_analysis']
+                )
+                results[index] = {'success': True, **assessment}
+        except Exception as e:
+            logger.warning(f"Combined risk assessment failed; assessing individually: {e}")
+
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            fallback = await self.assess_many([applications[index] for index in missing])
+            for index, result in zip(missing, fallback):
+                results[index] = result
+
+        return results
 
-            # Use structured output to force valid JSON (Gemini 3 supports this)
+    async def assess_many(self, applications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Assess several applications with concurrent structured-output calls
+
+        The structured requests are issued together, so round-trips overlap
+        instead of running one after another; each goes through the shared
+        LLM concurrency cap and rate-limit retry. Any application whose
+        structured call fails falls back to text parsing on its own.
+
+        Args:
+            applications: One dict per application with the keyword
+                arguments of assess
+
+        Returns:
+            Assessment dictionaries, in the same order as applications
+        """
+        if not applications:
+            return []
+
+        # Build prompts with all data; a failure only affects its own application
+        prompts: List[Any] = []
+        for application in applications:
             try:
-                structured_llm = self.llm.with_structured_output(AssessmentOutput, method="json_schema")
-                assessment_obj = structured_llm.invoke(prompt)
+                prompts.append(get_assessment_prompt(**application))
+            except Exception as e:
+                prompts.append(e)
+        ready = [index for index, prompt in enumerate(prompts) if isinstance(prompt, str)]
+
+        # Serve identical prompts from the response cache
+        structured_results: List[Any] = list(prompts)
+        cache_keys: Dict[int, str] = {}
+        misses = []
+        for index in ready:
+            if settings.LLM_RESPONSE_CACHE_TTL_SECONDS > 0:
+                cache_keys[index] = make_cache_key(
+                    getattr(self.llm, 'model', None), getattr(self.llm, 'temperature', None), prompts[index]
+                )
+                cached = _assessment_cache.get(cache_keys[index])
+                if cached is not None:
+                    structured_results[index] = orjson.loads(cached)
+                    continue
+            misses.append(index)
+
+        # Use structured output to force valid JSON (Gemini 3 supports this)
+        if misses:
+            outputs = await asyncio.gather(
+                *(
+                    ainvoke_with_retry(self._structured_llm, [_SYSTEM_MESSAGE, HumanMessage(content=prompts[index])])
+                    for index in misses
+                ),
+                return_exceptions=True
+            )
+            for index, output in zip(misses, outputs):
+                if isinstance(output, Exception):
+                    structured_results[index] = output
+                    continue
                 # Convert Pydantic model to dict
-                assessment = assessment_obj.model_dump()
-            except Exception as struct_error:
-                logger.warning(f"Structured output failed, falling back to parsing: {struct_error}")
+                assessment = output.model_dump()
+                structured_results[index] = assessment
+                if index in cache_keys:
+                    _assessment_cache.set(cache_keys[index], orjson.dumps(assessment))
+
+        return [
+            await self._finish_assessment(application, prompt, structured)
+            for application, prompt, structured in zip(applications, prompts, structured_results)
+        ]
+
+    async def _finish_assessment(
+        self,
+        application: Dict[str, Any],
+        prompt: Any,
+        structured: Any
+    ) -> Dict[str, Any]:
+        """
+        Turn one structured-output result into a validated assessment
+
+        Args:
+            application: Keyword arguments of assess for this application
+            prompt: Formatted assessment prompt, or the exception raised
+                while building it
+            structured: Structured assessment dict, or the exception the
+                structured call raised
+
+        Returns:
+            Dictionary with final assessment and decision
+        """
+        try:
+            if isinstance(prompt, Exception):
+                raise prompt
+
+            if isinstance(structured, Exception):
+                logger.warning(f"Structured output failed, falling back to parsing: {structured}")
                 # Fallback to text parsing if structured output fails
-                response = self.llm.invoke(prompt)
-                content = response.content
-                # LangChain/Gemini can return content as list of blocks (e.g. Gemini 3); normalize to str
-                if isinstance(content, list):
-                    content = " ".join(
-                        (getattr(block, "text", None) or str(block) if not isinstance(block, str) else block)
-                        for block in content
-                    )
-                elif not isinstance(content, str):
-                    content = str(content)
-                
-                logger.debug(f"Raw LLM response (first 500 chars): {content[:500]}")
-                # Parse LLM response
-                assessment = self._parse_response(content)
+                assessment = await self._stream_assessment(prompt)
+            else:
+                assessment = structured
 
             # Validate and enhance assessment
-            assessment = self._validate_assessment(
+            assessment = self._finalize_assessment(
                 assessment,
-                financial_analysis,
-                market_analysis
+                application['financial_analysis'],
+                application['market_analysis']
             )
 
             return {
@@ -121,13 +304,11 @@ class RiskAssessor:
 
         except Exception as e:
             # Return safe default on error
+            error = str(e)
             return {
-                'success': False,
-                'error': str(e),
-                'eligibility': 'review',
-                'confidence_score': 0.0,
-                'risk_level': 'high',
-                'reasoning': f'Error during assessment: {str(e)}',
+                **_FAILED_ASSESSMENT,
+                'error': error,
+                'reasoning': f'Error during assessment: {error}',
                 'recommendations': ['Manual review required due to system error'],
                 'key_factors': {
                     'financial_score': 0.0,
@@ -136,196 +317,155 @@ class RiskAssessor:
                 }
             }
 
-    def _parse_response(self, content: str) -> Dict[str, Any]:
-        """
-        Parse LLM response to extract assessment JSON.
-        Handles markdown code blocks, raw JSON, and balanced-brace extraction.
-        """
+    @staticmethod
+    def _normalize_llm_text(content: Any) -> str:
+        """Gemini/LangChain may return content as list of blocks; normalize to string."""
         if isinstance(content, list):
-            content = " ".join(
+            return " ".join(
                 (getattr(block, "text", None) or str(block) if not isinstance(block, str) else block)
                 for block in content
             )
-        if not isinstance(content, str):
-            content = str(content)
-
-        # 1) Extract from markdown code block (```json ... ``` or ``` ... ```)
-        for pattern in (r"```(?:json)?\s*([\s\S]*?)\s*```", r"```\s*([\s\S]*?)\s*```"):
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                raw = match.group(1).strip()
-                out = self._try_parse_json(raw)
-                if out is not None:
-                    return out
-
-        # 2) Extract first balanced {...} object
-        start = content.find("{")
-        if start != -1:
-            depth = 0
-            for i in range(start, len(content)):
-                if content[i] == "{":
-                    depth += 1
-                elif content[i] == "}":
-                    depth -= 1
-                    if depth == 0:
-                        raw = content[start : i + 1]
-                        out = self._try_parse_json(raw)
-                        if out is not None:
-                            return out
-                        break
-
-        # 3) Greedy regex as last resort
-        json_match = re.search(r"\{[\s\S]*\}", content)
-        if json_match:
-            out = self._try_parse_json(json_match.group())
-            if out is not None:
-                return out
-
-        return {
-            "eligibility": "review",
-            "confidence_score": 50.0,
-            "risk_level": "medium",
-            "reasoning": "Unable to parse LLM response - manual review recommended",
-            "recommendations": ["Manual review required"],
-            "key_factors": {
-                "financial_score": 50.0,
-                "market_score": 50.0,
-                "overall_score": 50.0,
-            },
-        }
+        if isinstance(content, str):
+            return content
+        return str(content)
 
-    def _try_parse_json(self, raw: str) -> Optional[Dict[str, Any]]:
-        """Try to parse a string as JSON; return None on failure."""
-        if not raw or not raw.strip():
-            return None
-        raw = raw.strip()
-        # Fix common LLM issues: replace single quotes with double (careful with apostrophes)
-        try:
-            return json.loads(raw)
-        except json.JSONDecodeError:
-            pass
-        # Try replacing single-quoted keys/strings (naive, for last resort)
-        try:
-            fixed = re.sub(r"'([^']*)'(\s*):", r'"\1"\2:', raw)
-            fixed = re.sub(r":\s*'([^']*)'", r': "\1"', fixed)
-            return json.loads(fixed)
-        except (json.JSONDecodeError, TypeError):
-            return None
+    async def _stream_assessment(self, prompt: str) -> Dict[str, Any]:
+        """
+        Stream a free-text assessment and stop once it holds a valid object
 
-    def _validate_assessment(
-        self,
-        assessment: Dict[str, Any],
-        financial_analysis: Dict[str, Any],
-        market_analysis: Dict[str, Any]
-    ) -> Dict[str, Any]:
+        Gemini often follows the JSON with commentary; reading stops as soon
+        as an object matching AssessmentOutput has closed, so the request
+        never waits on that trailing text.
+
+        Args:
+            prompt: Formatted assessment prompt
+
+        Returns:
+            Assessment dictionary matching AssessmentOutput
+
+        Raises:
+            ValueError: If the full response contains no valid assessment JSON
         """
-        Validate and enhance assessment with rule-based checks
+        content = ''
+        assessment = None
+        messages = [_SYSTEM_MESSAGE, HumanMessage(content=prompt)]
+        # aclosing: breaking out early closes the Gemini stream right away
+        async with aclosing(astream_with_retry(self.llm, messages)) as stream:
+            async for chunk in stream:
+                text = self._normalize_llm_text(chunk.content)
+                content += text
+                if '}' not in text:
+                    continue
+                try:
+                    assessment = self._parse_response(content)
+                except ValueError:
+                    continue
+                break
+
+        if assessment is None:
+            logger.debug(f"Raw LLM response (first 500 chars): {content[:500]}")
+            # A schema mismatch fails the assessment
+            assessment = self._parse_response(content)
+        return assessment
+
+    def _parse_response(self, content: str) -> Dict[str, Any]:
+        """
+        Validate the assessment JSON in a free-text LLM response
+
+        Tries the whole reply first in one model_validate_json pass, then
+        each JSON object embedded in surrounding prose or code fences.
 
         Args:
-            assessment: LLM-generated assessment
-            financial_analysis: Financial data
-            market_analysis: Market data
+            content: Normalized response text
 
         Returns:
-            Validated and enhanced assessment
+            Assessment dictionary matching AssessmentOutput
+
+        Raises:
+            ValueError: If no object in the response matches the schema
         """
-        # Ensure required fields exist and are the right type
-        if 'eligibility' not in assessment:
-            assessment['eligibility'] = 'review'
-
-        if 'confidence_score' not in assessment:
-            assessment['confidence_score'] = 50.0
-
-        if 'risk_level' not in assessment:
-            assessment['risk_level'] = 'medium'
-
-        if 'reasoning' not in assessment:
-            assessment['reasoning'] = 'Assessment completed'
-        # LLM may return reasoning as a list (e.g. multiple blocks); normalize to str
-        if isinstance(assessment['reasoning'], list):
-            assessment['reasoning'] = ' '.join(str(x) for x in assessment['reasoning'])
-        elif not isinstance(assessment['reasoning'], str):
-            assessment['reasoning'] = str(assessment['reasoning'])
-
-        if 'recommendations' not in assessment:
-            assessment['recommendations'] = []
-
-        if 'key_factors' not in assessment:
-            # Calculate key factors from data
-            financial_score = financial_analysis.get('financial_health_score', 50.0)
-            market_score = market_analysis.get('viability_score', 50.0)
-            overall_score = (financial_score + market_score) / 2
-
-            assessment['key_factors'] = {
-                'financial_score': financial_score,
-                'market_score': market_score,
-                'overall_score': overall_score
-            }
+        stripped = content.strip()
+        if stripped.startswith("{") and stripped.endswith("}"):
+            try:
+                return AssessmentOutput.model_validate_json(stripped).model_dump()
+            except ValidationError:
+                pass
 
-        # Apply rule-based validation
-        assessment = self._apply_business_rules(
-            assessment,
-            financial_analysis,
-            market_analysis
-        )
+        for candidate in iter_json_objects(content):
+            try:
+                return AssessmentOutput.model_validate(candidate).model_dump()
+            except ValidationError:
+                continue
 
-        return assessment
+        raise ValueError("LLM response contained no valid assessment JSON")
 
-    def _apply_business_rules(
+    def _finalize_assessment(
         self,
         assessment: Dict[str, Any],
         financial_analysis: Dict[str, Any],
         market_analysis: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
-        Apply business rules to validate LLM decision
+        Apply business rules to the LLM decision
+
+        Every caller passes an AssessmentOutput dump, so all fields are
+        present and typed; only the decision itself is adjusted here.
 
         Args:
-            assessment: Current assessment
+            assessment: LLM-generated assessment
             financial_analysis: Financial data
             market_analysis: Market data
 
         Returns:
-            Assessment with business rules applied
+            Validated and enhanced assessment
         """
+        reasoning = assessment['reasoning']
+
         # Extract key metrics
-        dti_ratio = financial_analysis.get('debt_to_income_ratio', 0)
-        income_stability = financial_analysis.get('income_stability_score', 0)
-        overdrafts = financial_analysis.get('overdraft_count', 0)
-        financial_health = financial_analysis.get('financial_health_score', 0)
+        dti_ratio, income_stability, overdrafts, financial_health = (
+            financial_analysis.get(key, 0) for key in _FINANCIAL_RULE_METRICS
+        )
         market_viability = market_analysis.get('viability_score', 0)
 
+        eligibility = assessment['eligibility']
+        risk_level = assessment['risk_level']
+        notes = []
+
         # Critical rejection criteria
         if dti_ratio > 60:
-            assessment['eligibility'] = 'denied'
-            assessment['risk_level'] = 'high'
-            if 'Debt-to-income ratio exceeds 60%' not in assessment['reasoning']:
-                assessment['reasoning'] += ' Critical: Debt-to-income ratio exceeds 60%.'
+            eligibility = 'denied'
+            risk_level = 'high'
+            if 'Debt-to-income ratio exceeds 60%' not in reasoning:
+                notes.append(' Critical: Debt-to-income ratio exceeds 60%.')
 
         if overdrafts > 5:
-            assessment['risk_level'] = 'high'
-            if assessment['eligibility'] == 'approved':
-                assessment['eligibility'] = 'review'
-            if 'Multiple overdrafts' not in assessment['reasoning']:
-                assessment['reasoning'] += ' Concern: Multiple overdrafts detected.'
+            risk_level = 'high'
+            if eligibility == 'approved':
+                eligibility = 'review'
+            if 'Multiple overdrafts' not in reasoning:
+                notes.append(' Concern: Multiple overdrafts detected.')
 
         if income_stability < 30:
-            assessment['risk_level'] = 'high'
-            if assessment['eligibility'] == 'approved':
-                assessment['eligibility'] = 'review'
+            risk_level = 'high'
+            if eligibility == 'approved':
+                eligibility = 'review'
 
         # Strong approval criteria
         if (financial_health >= 75 and market_viability >= 70 and
             dti_ratio < 30 and overdrafts == 0):
-            if assessment['eligibility'] == 'review':
-                assessment['eligibility'] = 'approved'
-                assessment['risk_level'] = 'low'
+            if eligibility == 'review':
+                eligibility = 'approved'
+                risk_level = 'low'
 
         # Ensure risk level matches eligibility
-        if assessment['eligibility'] == 'denied' and assessment['risk_level'] == 'low':
-            assessment['risk_level'] = 'high'
+        if eligibility == 'denied' and risk_level == 'low':
+            risk_level = 'high'
+
+        if eligibility == 'approved' and risk_level == 'high':
+            eligibility = 'review'
 
-        if assessment['eligibility'] == 'approved' and assessment['risk_level'] == 'high':
-            assessment['eligibility'] = 'review'
+        assessment['eligibility'] = eligibility
+        assessment['risk_level'] = risk_level
+        assessment['reasoning'] = ''.join([reasoning, *notes]) if notes else reasoning
 
         return assessment
@@ -1,7 +1,26 @@
 """
 Prompts for Risk Assessor agent
 """
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List
+
+import orjson
+
+# Upstream agent results are rendered as compact JSON in the prompt
+_JSON_PROMPT_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Fields of each agent's result the assessment actually reasons about; the
+# rest (status flags, raw nearby business lists) only cost input tokens
+_FINANCIAL_PROMPT_KEYS = (
+    'monthly_income', 'monthly_expenses', 'debt_to_income_ratio', 'savings_rate',
+    'avg_monthly_balance', 'min_balance_6mo', 'overdraft_count',
+    'income_stability_score', 'financial_health_score',
+    'key_findings', 'concerns', 'strengths'
+)
+_MARKET_PROMPT_KEYS = (
+    'competitor_count', 'market_density', 'viability_score',
+    'market_insights', 'opportunities', 'risks'
+)
 
 SYSTEM_PROMPT = """You are a Risk Assessor AI agent specializing in loan application evaluation and risk analysis.
 
@@ -43,9 +62,7 @@ Do not:
 """
 
 
-ASSESSMENT_PROMPT_TEMPLATE = """Evaluate this loan application and provide a final assessment.
-
-APPLICANT INFORMATION:
+ASSESSMENT_DATA_TEMPLATE = """APPLICANT INFORMATION:
 - Job/Business: {user_job}
 - Age: {user_age}
 - Loan Amount: ${loan_amount:,.2f}
@@ -56,8 +73,10 @@ FINANCIAL ANALYSIS:
 
 MARKET ANALYSIS:
 {market_analysis}
+"""
+
 
-TASK:
+ASSESSMENT_INSTRUCTIONS = """TASK:
 Synthesize the financial and market data to make a final loan decision.
 
 Consider:
@@ -95,6 +114,31 @@ Be thorough and specific in your reasoning. The decision must be well-justified
 """
 
 
+# Static role and task instructions, sent as the system message ahead of the
+# per-application data so Gemini can serve the shared prefix from its cache
+ASSESSMENT_SYSTEM_PROMPT = SYSTEM_PROMPT + "\n" + ASSESSMENT_INSTRUCTIONS
+
+
+# Per-application human message: only the applicant and agent data
+ASSESSMENT_PROMPT_TEMPLATE = (
+    "Evaluate this loan application and provide a final assessment.\n\n"
+    + ASSESSMENT_DATA_TEMPLATE
+)
+
+
+ASSESSMENT_BATCH_HEADER = """Evaluate each of the {application_count} loan applications below independently of one another and provide a final assessment for each.
+"""
+
+
+ASSESSMENT_BATCH_FORMAT = """Return one assessment per application in a results list, keyed by the application ID shown in its heading:
+{
+  "results": [
+    {"application_id": "<application ID>", "eligibility": ..., "confidence_score": ..., "risk_level": ..., "reasoning": ..., "recommendations": [...], "key_factors": {...}}
+  ]
+}
+"""
+
+
 def get_assessment_prompt(
     user_job: str,
     user_age: int,
@@ -117,19 +161,88 @@ def get_assessment_prompt(
     Returns:
         Formatted prompt string
     """
-    import json
+    return get_assessment_prompt_from_json(
+        user_job, user_age, loan_amount, loan_purpose,
+        _serialize_for_prompt(financial_analysis, _FINANCIAL_PROMPT_KEYS),
+        _serialize_for_prompt(market_analysis, _MARKET_PROMPT_KEYS)
+    )
+
+
+def _serialize_for_prompt(analysis: Dict[str, Any], keys: tuple) -> str:
+    """
+    Render the prompt-relevant fields of an agent result as compact JSON
+
+    Args:
+        analysis: Results from an upstream agent
+        keys: Fields to include, in prompt order
+
+    Returns:
+        JSON string
+    """
+    slim = {key: analysis[key] for key in keys if key in analysis}
+    return orjson.dumps(slim, option=_JSON_PROMPT_OPTIONS, default=str).decode()
+
+
+@lru_cache(maxsize=256)
+def get_assessment_prompt_from_json(
+    user_job: str,
+    user_age: int,
+    loan_amount: float,
+    loan_purpose: str,
+    financial_json: str,
+    market_json: str
+) -> str:
+    """
+    Generate assessment prompt from pre-serialized agent results
 
-    # Format financial analysis
-    financial_str = json.dumps(financial_analysis, indent=2)
+    Memoized on its arguments, so retried or replayed assessments skip
+    template formatting.
 
-    # Format market analysis
-    market_str = json.dumps(market_analysis, indent=2)
+    Args:
+        user_job: Applicant's job
+        user_age: Applicant's age
+        loan_amount: Requested loan amount
+        loan_purpose: Purpose of loan
+        financial_json: Financial Analyst results as JSON
+        market_json: Market Researcher results as JSON
 
+    Returns:
+        Formatted prompt string
+    """
     return ASSESSMENT_PROMPT_TEMPLATE.format(
         user_job=user_job,
         user_age=user_age,
         loan_amount=loan_amount,
         loan_purpose=loan_purpose,
-        financial_analysis=financial_str,
-        market_analysis=market_str
+        financial_analysis=financial_json,
+        market_analysis=market_json
     )
+
+
+def get_assessment_batch_prompt(applications: List[Dict[str, Any]]) -> str:
+    """
+    Generate one prompt covering several applications
+
+    The task instructions travel once for the whole batch, in the system
+    message (ASSESSMENT_SYSTEM_PROMPT).
+
+    Args:
+        applications: Keyword arguments for get_assessment_prompt, one dict
+            per application, each with an additional 'application_id' key
+
+    Returns:
+        Formatted prompt string
+    """
+    sections = [ASSESSMENT_BATCH_HEADER.format(application_count=len(applications))]
+    for application in applications:
+        sections.append(f"# Application {application['application_id']}\n\n" + ASSESSMENT_DATA_TEMPLATE.format(
+            user_job=application['user_job'],
+            user_age=application['user_age'],
+            loan_amount=application['loan_amount'],
+            loan_purpose=application['loan_purpose'],
+            financial_analysis=_serialize_for_prompt(application['financial_analysis'], _FINANCIAL_PROMPT_KEYS),
+            market_analysis=_serialize_for_prompt(application['market_analysis'], _MARKET_PROMPT_KEYS)
+        ))
+
+    sections.append(ASSESSMENT_BATCH_FORMAT)
+    return "\n".join(sections)
@@ -3,7 +3,9 @@ Authentication Routes
 
 Dummy authentication endpoints for sandbox/demo use
 """
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, EmailStr
 
 from app.core.auth import DummyAuthService
@@ -11,6 +13,15 @@ from app.models.schemas import UserResponse
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# The dummy auth service only ever returns its constant sandbox user, so the
+# user payload is validated and serialized once at import time; handlers
+# return responses directly and skip response_model re-validation
+_SANDBOX_USER_DATA = UserResponse.model_validate(DummyAuthService.SANDBOX_USER).model_dump(mode="json")
+_SANDBOX_USER_BODY = orjson.dumps(_SANDBOX_USER_DATA)
+
+_LOGIN_MESSAGE = "Logged in as sandbox user. Connected to Plaid sandbox environment."
+_REGISTER_MESSAGE = "Registered as sandbox user. Connected to Plaid sandbox environment."
+
 
 class LoginRequest(BaseModel):
     """Login request"""
@@ -54,16 +65,7 @@ async def login(request: LoginRequest):
 
     token = DummyAuthService.create_token(user.id)
 
-    return LoginResponse(
-        user=UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            created_at=user.created_at
-        ),
-        token=token,
-        message="Logged in as sandbox user. Connected to Plaid sandbox environment."
-    )
+    return ORJSONResponse({'user': _SANDBOX_USER_DATA, 'token': token, 'message': _LOGIN_MESSAGE})
 
 
 @router.post("/register", response_model=LoginResponse)
@@ -85,16 +87,7 @@ async def register(request: RegisterRequest):
 
     token = DummyAuthService.create_token(user.id)
 
-    return LoginResponse(
-        user=UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            created_at=user.created_at
-        ),
-        token=token,
-        message="Registered as sandbox user. Connected to Plaid sandbox environment."
-    )
+    return ORJSONResponse({'user': _SANDBOX_USER_DATA, 'token': token, 'message': _REGISTER_MESSAGE})
 
 
 @router.get("/me", response_model=UserResponse)
@@ -107,11 +100,4 @@ async def get_current_user():
     Returns:
         Current user (sandbox user)
     """
-    user = DummyAuthService.get_current_user()
-
-    return UserResponse(
-        id=user.id,
-        email=user.email,
-        name=user.name,
-        created_at=user.created_at
-    )
+    return Response(content=_SANDBOX_USER_BODY, media_type="application/json")
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, Set, Tuple
+import asyncio
+import hashlib
+import itertools
+import logging
+import time
 import uuid
 import json
-from datetime import datetime
+import orjson
+from datetime import datetime, timezone
 
-from app.database.session import get_db
+from app.database.session import AsyncSessionLocal, get_db
 from app.database import models
 from app.models.schemas import (
     ApplicationCreate,
@@ -37,13 +44,72 @@ from app.models.schemas import (
     StabilityDataPoint,
     ReasoningLogEntry,
 )
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.core.security import encrypt_token, decrypt_token
-from app.services.plaid_service import PlaidService
-from app.services.google_service import GoogleService
-from app.agents.orchestrator import Orchestrator
-from sqlalchemy import select
+from app.services.plaid_service import PlaidService, get_plaid_service
+from app.services.google_service import get_google_service
+from app.agents.orchestrator import Orchestrator, get_orchestrator
+from sqlalchemy import delete, insert, select
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# (ETag, body) of serialized assessment responses of completed applications.
+# Results only change when an assessment run starts, fails or completes
+# (each of which evicts the entry), so hot re-reads skip the database, JSON
+# parsing and response validation.
+_assessment_response_cache = TTLCache(maxsize=1024, ttl=settings.ASSESSMENT_RESPONSE_CACHE_TTL_SECONDS)
+
+# Per-application invalidation counter. A read only caches the body it built
+# if no invalidation happened since it started, so a read that saw the old
+# completed row cannot re-cache it after a re-run has begun.
+_assessment_response_generations = TTLCache(maxsize=4096, ttl=settings.ASSESSMENT_RESPONSE_CACHE_TTL_SECONDS)
+_assessment_response_generation_seq = itertools.count(1)
+
+
+# Clients waiting on /events for an application's assessment run to finish;
+# each waiter owns its event so one disconnecting never strands the others
+_assessment_waiters: Dict[str, Set[asyncio.Event]] = {}
+
+# Keep-alive comment interval and overall cap for an /events stream
+_EVENTS_KEEPALIVE_SECONDS = 15.0
+_EVENTS_MAX_WAIT_SECONDS = 300.0
+
+
+def _invalidate_assessment_response(application_id: str):
+    """
+    Drop an application's cached assessment response
+
+    Also bumps its generation so reads already in flight don't store theirs.
+
+    Args:
+        application_id: Application whose results changed or are being rebuilt
+    """
+    _assessment_response_cache.delete(application_id)
+    _assessment_response_generations.set(application_id, next(_assessment_response_generation_seq))
+
+
+def _etag_response(request: Request, etag: str, body: bytes) -> Response:
+    """
+    Return a JSON body, or 304 Not Modified if the client already holds it
+
+    Args:
+        request: Incoming request (read for If-None-Match)
+        etag: Quoted entity tag of body
+        body: Serialized JSON response
+
+    Returns:
+        Response carrying the ETag header
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @router.post("/applications", response_model=ApplicationResponse)
@@ -69,12 +135,14 @@ async def create_application(
         location_address=application.location.address,
         loan_amount=application.loan_amount,
         loan_purpose=application.loan_purpose,
-        status=ApplicationStatus.PENDING_PLAID.value
+        status=ApplicationStatus.PENDING_PLAID.value,
+        # Set here rather than by the server default, so the response needs
+        # no refresh SELECT after the insert
+        created_at=datetime.now(timezone.utc)
     )
 
     db.add(db_application)
     await db.commit()
-    await db.refresh(db_application)
 
     return ApplicationResponse(
         application_id=app_id,
@@ -86,20 +154,17 @@ async def create_application(
 @router.post("/applications/{application_id}/plaid-link-token")
 async def get_plaid_link_token(
     application_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    plaid_service: PlaidService = Depends(get_plaid_service)
 ):
     """
     Create a Plaid Link token for the application (for Link UI or sandbox).
     """
-    result = await db.execute(
-        select(models.Application).where(models.Application.id == application_id)
-    )
-    application = result.scalar_one_or_none()
+    application = await db.get(models.Application, application_id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    plaid_service = PlaidService()
-    link_token = plaid_service.create_link_token(application_id)
+    link_token = await plaid_service.acreate_link_token(application_id)
     return {"link_token": link_token}
 
 
@@ -118,8 +183,8 @@ async def places_autocomplete(
     if not query or len(query.strip()) < 2:
         return {"predictions": []}
     try:
-        svc = GoogleService()
-        predictions = svc.places_autocomplete(query.strip(), session_token=session_token)
+        svc = get_google_service()
+        predictions = await asyncio.to_thread(svc.places_autocomplete, query.strip(), session_token=session_token)
         return {"predictions": predictions}
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Places autocomplete failed: {str(e)}")
@@ -136,8 +201,8 @@ async def places_details(
     if not place_id:
         raise HTTPException(status_code=400, detail="place_id required")
     try:
-        svc = GoogleService()
-        result = svc.get_place_details(place_id, session_token=session_token)
+        svc = get_google_service()
+        result = await asyncio.to_thread(svc.get_place_details, place_id, session_token=session_token)
         return {"result": result, "status": "OK" if result else "ZERO_RESULTS"}
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Place details failed: {str(e)}")
@@ -149,8 +214,8 @@ async def places_reverse_geocode(lat: float, lng: float):
     Reverse geocode lat/lng to address (e.g. for "Use current location").
     """
     try:
-        svc = GoogleService()
-        result = svc.reverse_geocode(lat, lng)
+        svc = get_google_service()
+        result = await asyncio.to_thread(svc.reverse_geocode, lat, lng)
         if not result:
             return {"results": [], "status": "ZERO_RESULTS"}
         return {"results": [result], "status": "OK"}
@@ -169,31 +234,32 @@ class PlaidSandboxRequest(BaseModel):
 async def connect_plaid_sandbox(
     application_id: str,
     body: PlaidSandboxRequest,
-    db: AsyncSession = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    plaid_service: PlaidService = Depends(get_plaid_service)
 ):
     """
     Connect using Plaid sandbox: create a sandbox public token, exchange it, and run assessment.
     Frontend sends optional institution_id (e.g. ins_109508). No real credentials needed.
+    The assessment runs after the response is sent; clients poll /status for results.
     """
-    result = await db.execute(
-        select(models.Application).where(models.Application.id == application_id)
-    )
-    application = result.scalar_one_or_none()
+    application = await db.get(models.Application, application_id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    plaid_service = PlaidService()
     institution_id = body.institution_id or "ins_109508"
     try:
-        public_token = plaid_service.create_sandbox_public_token(institution_id=institution_id)
-        access_token = plaid_service.exchange_public_token(public_token)
+        public_token = await plaid_service.acreate_sandbox_public_token(institution_id)
+        access_token = await plaid_service.aexchange_public_token(public_token)
 
         encrypted_token = encrypt_token(access_token)
         application.plaid_access_token = encrypted_token
         application.status = ApplicationStatus.PROCESSING.value
         await db.commit()
+        # A re-run supersedes any previously served results
+        _invalidate_assessment_response(application_id)
 
-        await process_assessment(application_id, db)
+        background_tasks.add_task(run_assessment_in_background, application_id)
 
         return PlaidConnectResponse(
             application_id=application_id,
@@ -211,28 +277,25 @@ async def connect_plaid_sandbox(
 async def connect_plaid(
     application_id: str,
     plaid_data: PlaidConnect,
-    db: AsyncSession = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    plaid_service: PlaidService = Depends(get_plaid_service)
 ):
     """
     Connect Plaid account to application
 
-    Exchanges public token for access token and triggers assessment
+    Exchanges public token for access token and triggers assessment, which
+    runs after the response is sent; clients poll /status for results
     """
     # Get application
-    result = await db.execute(
-        select(models.Application).where(models.Application.id == application_id)
-    )
-    application = result.scalar_one_or_none()
+    application = await db.get(models.Application, application_id)
 
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
 
     # Exchange token
-    plaid_service = PlaidService()
     try:
-        access_token = plaid_service.exchange_public_token(
-            plaid_data.plaid_public_token
-        )
+        access_token = await plaid_service.aexchange_public_token(plaid_data.plaid_public_token)
 
         # Encrypt and store access token
         encrypted_token = encrypt_token(access_token)
@@ -240,10 +303,11 @@ async def connect_plaid(
         application.status = ApplicationStatus.PROCESSING.value
 
         await db.commit()
+        # A re-run supersedes any previously served results
+        _invalidate_assessment_response(application_id)
 
-        # Trigger async assessment (in production, use background task)
-        # For now, we'll process synchronously
-        await process_assessment(application_id, db)
+        # Assess after the response is sent instead of holding it open
+        background_tasks.add_task(run_assessment_in_background, application_id)
 
         return PlaidConnectResponse(
             application_id=application_id,
@@ -258,17 +322,60 @@ async def connect_plaid(
         )
 
 
+async def run_assessment_in_background(application_id: str):
+    """
+    Run process_assessment on its own database session
+
+    Scheduled as a background task once the connect response has been
+    sent, by which point the request's session is closed. Failures are
+    logged and the application is marked failed, so /status and /events
+    report a terminal state. Either way, /events subscribers are woken
+    when it ends.
+
+    Args:
+        application_id: Application to assess
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            await process_assessment(application_id, db)
+    except Exception as e:
+        logger.error(f"Background assessment failed for {application_id}: {e}", exc_info=True)
+        _invalidate_assessment_response(application_id)
+        await _mark_assessment_failed(application_id)
+    finally:
+        # Wake /events subscribers so they report the final status
+        for event in _assessment_waiters.pop(application_id, ()):
+            event.set()
+
+
+async def _mark_assessment_failed(application_id: str):
+    """
+    Record a failed assessment run on a fresh session
+
+    The run's own session may be unusable after the error, so the status is
+    written separately. Errors here are only logged.
+
+    Args:
+        application_id: Application whose run failed
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            application = await db.get(models.Application, application_id)
+            if application is not None:
+                application.status = ApplicationStatus.FAILED.value
+                await db.commit()
+    except Exception as e:
+        logger.error(f"Could not mark assessment failed for {application_id}: {e}", exc_info=True)
+
+
 async def process_assessment(application_id: str, db: AsyncSession):
     """
     Process loan assessment using multi-agent orchestrator
 
-    This would typically be run as a background task
+    Run as a background task by run_assessment_in_background
     """
     # Get application
-    result = await db.execute(
-        select(models.Application).where(models.Application.id == application_id)
-    )
-    application = result.scalar_one_or_none()
+    application = await db.get(models.Application, application_id)
 
     if not application:
         return
@@ -284,8 +391,8 @@ async def process_assessment(application_id: str, db: AsyncSession):
             logger = logging.getLogger(__name__)
             logger.error(f"Failed to decrypt Plaid token for {application_id}: {e}")
 
-    # Create orchestrator and run assessment
-    orchestrator = Orchestrator()
+    # Run assessment on the shared orchestrator
+    orchestrator = get_orchestrator()
     results = await orchestrator.run_assessment(
         application_id=application_id,
         access_token=access_token,
@@ -304,81 +411,87 @@ async def process_assessment(application_id: str, db: AsyncSession):
     recommendations_list = results.get('recommendations', [])
     reasoning_log = results.get('reasoning_log', [])
 
-    # Save results to database
+    # Save results to database as plain row dicts, inserted below with Core
+    # INSERTs (no ORM objects or unit-of-work bookkeeping for write-once rows)
     # Save financial metrics
-    financial_id = str(uuid.uuid4())
-    db_financial = models.FinancialMetrics(
-        id=financial_id,
-        application_id=application_id,
-        monthly_income=financial_metrics.get('monthly_income', 0.0),
-        monthly_expenses=financial_metrics.get('monthly_expenses', 0.0),
-        debt_to_income_ratio=financial_metrics.get('debt_to_income_ratio', 0.0),
-        savings_rate=financial_metrics.get('savings_rate', 0.0),
-        avg_monthly_balance=financial_metrics.get('avg_monthly_balance', 0.0),
-        min_balance_6mo=financial_metrics.get('min_balance_6mo', 0.0),
-        overdraft_count=financial_metrics.get('overdraft_count', 0),
-        income_stability_score=financial_metrics.get('income_stability_score', 0.0),
-        raw_plaid_data=json.dumps(financial_metrics)
-    )
-    db.add(db_financial)
+    financial_row = {
+        'id': str(uuid.uuid4()),
+        'application_id': application_id,
+        'monthly_income': financial_metrics.get('monthly_income', 0.0),
+        'monthly_expenses': financial_metrics.get('monthly_expenses', 0.0),
+        'debt_to_income_ratio': financial_metrics.get('debt_to_income_ratio', 0.0),
+        'savings_rate': financial_metrics.get('savings_rate', 0.0),
+        'avg_monthly_balance': financial_metrics.get('avg_monthly_balance', 0.0),
+        'min_balance_6mo': financial_metrics.get('min_balance_6mo', 0.0),
+        'overdraft_count': financial_metrics.get('overdraft_count', 0),
+        'income_stability_score': financial_metrics.get('income_stability_score', 0.0),
+        'raw_plaid_data': financial_metrics
+    }
 
     # Save market analysis (market_density must be low/medium/high for schema)
     density_raw = market_analysis.get('market_density', 'medium')
     density_val = density_raw if density_raw in ('low', 'medium', 'high') else 'medium'
-    market_id = str(uuid.uuid4())
-    db_market = models.MarketAnalysis(
-        id=market_id,
-        application_id=application_id,
-        competitor_count=market_analysis.get('competitor_count', 0),
-        market_density=density_val,
-        viability_score=market_analysis.get('viability_score', 50.0),
-        market_insights=market_analysis.get('market_insights', ''),
-        nearby_businesses=json.dumps(market_analysis.get('nearby_businesses', []))
-    )
-    db.add(db_market)
+    market_row = {
+        'id': str(uuid.uuid4()),
+        'application_id': application_id,
+        'competitor_count': market_analysis.get('competitor_count', 0),
+        'market_density': density_val,
+        'viability_score': market_analysis.get('viability_score', 50.0),
+        'market_insights': market_analysis.get('market_insights', ''),
+        'nearby_businesses': market_analysis.get('nearby_businesses', [])
+    }
 
     # Save assessment (including reasoning log for traceability)
-    assessment_id = str(uuid.uuid4())
-    db_assessment = models.Assessment(
-        id=assessment_id,
-        application_id=application_id,
-        eligibility=final_assessment.get('eligibility', 'review'),
-        confidence_score=final_assessment.get('confidence_score', 0.0),
-        risk_level=final_assessment.get('risk_level', 'medium'),
-        reasoning=final_assessment.get('reasoning', ''),
-        recommendations=json.dumps(final_assessment.get('recommendations', [])),
-        reasoning_log=json.dumps(reasoning_log) if reasoning_log else None,
-    )
-    db.add(db_assessment)
+    assessment_row = {
+        'id': str(uuid.uuid4()),
+        'application_id': application_id,
+        'eligibility': final_assessment.get('eligibility', 'review'),
+        'confidence_score': final_assessment.get('confidence_score', 0.0),
+        'risk_level': final_assessment.get('risk_level', 'medium'),
+        'reasoning': final_assessment.get('reasoning', ''),
+        'recommendations': final_assessment.get('recommendations', []),
+        'reasoning_log': orjson.dumps(reasoning_log).decode() if reasoning_log else None,
+    }
 
     # Save individual recommendations (normalize priority to lowercase for DB/enum)
+    recommendation_rows = []
     for rec in recommendations_list:
-        rec_id = str(uuid.uuid4())
         priority_raw = rec.get('priority', 'medium')
         priority_val = priority_raw.lower() if isinstance(priority_raw, str) else 'medium'
         if priority_val not in ('high', 'medium', 'low'):
             priority_val = 'medium'
-        db_recommendation = models.Recommendation(
-            id=rec_id,
-            application_id=application_id,
-            priority=priority_val,
-            category=rec.get('category') or 'General',
-            title=rec.get('title') or '',
-            evidence_summary=rec.get('evidence_summary') or '',
-            why_matters=rec.get('why_matters') or '',
-            recommended_action=rec.get('recommended_action') or '',
-            expected_impact=rec.get('expected_impact') or '',
-            evidence_data=json.dumps({
+        recommendation_rows.append({
+            'id': str(uuid.uuid4()),
+            'application_id': application_id,
+            'priority': priority_val,
+            'category': rec.get('category') or 'General',
+            'title': rec.get('title') or '',
+            'evidence_summary': rec.get('evidence_summary') or '',
+            'why_matters': rec.get('why_matters') or '',
+            'recommended_action': rec.get('recommended_action') or '',
+            'expected_impact': rec.get('expected_impact') or '',
+            'evidence_data': orjson.dumps({
                 'transactions': rec.get('evidence_transactions', []),
                 'patterns': rec.get('evidence_patterns', []),
                 'stats': rec.get('evidence_stats', {})
-            })
-        )
-        db.add(db_recommendation)
+            }, option=orjson.OPT_NON_STR_KEYS).decode()
+        })
+
+    # A re-assessment replaces the previous run's rows, keeping results 1:1
+    # with the application so the joined reads see only the latest run
+    for model in (models.FinancialMetrics, models.MarketAnalysis, models.Assessment, models.Recommendation):
+        await db.execute(delete(model).where(model.application_id == application_id))
+
+    await db.execute(insert(models.FinancialMetrics), [financial_row])
+    await db.execute(insert(models.MarketAnalysis), [market_row])
+    await db.execute(insert(models.Assessment), [assessment_row])
+    if recommendation_rows:
+        await db.execute(insert(models.Recommendation), recommendation_rows)
 
     # Update application status
     application.status = ApplicationStatus.COMPLETED.value
     await db.commit()
+    _invalidate_assessment_response(application_id)
 
 
 @router.get("/applications/{application_id}/status", response_model=ApplicationStatusResponse)
@@ -389,19 +502,18 @@ async def get_application_status(
     """
     Get application status
     """
+    # Application and its assessment (if any) in one round-trip
     result = await db.execute(
-        select(models.Application).where(models.Application.id == application_id)
+        select(models.Application, models.Assessment)
+        .outerjoin(models.Assessment, models.Assessment.application_id == models.Application.id)
+        .where(models.Application.id == application_id)
     )
-    application = result.scalar_one_or_none()
+    row = result.first()
 
-    if not application:
+    if not row:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    # Check if assessment exists
-    assessment_result = await db.execute(
-        select(models.Assessment).where(models.Assessment.application_id == application_id)
-    )
-    assessment = assessment_result.scalar_one_or_none()
+    application, assessment = row
 
     return ApplicationStatusResponse(
         application_id=application_id,
@@ -412,65 +524,158 @@ async def get_application_status(
     )
 
 
+async def _read_status_event(application_id: str) -> Optional[Tuple[str, bytes]]:
+    """
+    Read an application's status as one server-sent event
+
+    Uses a short-lived session so no transaction stays open while the
+    stream waits (SQLite would block the assessment's commit behind it).
+
+    Args:
+        application_id: Application to read
+
+    Returns:
+        (status, encoded "status" event), or None if the application does
+        not exist
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(models.Application.status, models.Assessment.id)
+            .outerjoin(models.Assessment, models.Assessment.application_id == models.Application.id)
+            .where(models.Application.id == application_id)
+        )
+        row = result.first()
+
+    if not row:
+        return None
+
+    payload = orjson.dumps({
+        'application_id': application_id,
+        'status': row[0],
+        'has_results': row[1] is not None
+    })
+    return row[0], b"event: status\ndata: " + payload + b"\n\n"
+
+
+@router.get("/applications/{application_id}/events")
+async def stream_application_events(application_id: str):
+    """
+    Stream application status as server-sent events
+
+    Emits the current status at once; while an assessment is still
+    processing, holds the connection (with keep-alive comments) and emits
+    the status again as soon as the run finishes, replacing /status
+    polling. Completion is signalled in-process, so with several server
+    workers a client may need to fall back to /status.
+    """
+    # Register before reading the status so a run finishing in between
+    # still wakes this stream
+    event = asyncio.Event()
+    _assessment_waiters.setdefault(application_id, set()).add(event)
+
+    def _unregister():
+        waiters = _assessment_waiters.get(application_id)
+        if waiters is not None:
+            waiters.discard(event)
+            if not waiters:
+                del _assessment_waiters[application_id]
+
+    try:
+        current = await _read_status_event(application_id)
+    except Exception:
+        _unregister()
+        raise
+    if current is None:
+        _unregister()
+        raise HTTPException(status_code=404, detail="Application not found")
+    current_status, first = current
+
+    async def _events() -> AsyncIterator[bytes]:
+        try:
+            yield first
+            if current_status != ApplicationStatus.PROCESSING.value:
+                return
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + _EVENTS_MAX_WAIT_SECONDS
+            while not event.is_set():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                try:
+                    await asyncio.wait_for(event.wait(), min(_EVENTS_KEEPALIVE_SECONDS, remaining))
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+
+            final = await _read_status_event(application_id)
+            if final is not None:
+                yield final[1]
+        finally:
+            _unregister()
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/applications/{application_id}/assessment", response_model=AssessmentResponse)
 async def get_assessment(
     application_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get complete assessment results
+
+    Served from the in-process response cache once an application's results
+    have been read after completion. Responses carry an ETag; a matching
+    If-None-Match gets 304 Not Modified.
     """
-    # Get application
-    app_result = await db.execute(
-        select(models.Application).where(models.Application.id == application_id)
+    cached = _assessment_response_cache.get(application_id)
+    if cached is not None:
+        return _etag_response(request, *cached)
+    generation = _assessment_response_generations.get(application_id)
+
+    # Application and its stored results in one round-trip
+    result = await db.execute(
+        select(models.Application, models.Assessment, models.FinancialMetrics, models.MarketAnalysis)
+        .outerjoin(models.Assessment, models.Assessment.application_id == models.Application.id)
+        .outerjoin(models.FinancialMetrics, models.FinancialMetrics.application_id == models.Application.id)
+        .outerjoin(models.MarketAnalysis, models.MarketAnalysis.application_id == models.Application.id)
+        .where(models.Application.id == application_id)
     )
-    application = app_result.scalar_one_or_none()
+    row = result.first()
 
-    if not application:
+    if not row:
         raise HTTPException(status_code=404, detail="Application not found")
 
+    application, assessment, financial, market = row
+
     if application.status != ApplicationStatus.COMPLETED.value:
         raise HTTPException(
             status_code=400,
             detail="Assessment not yet complete"
         )
 
-    # Get assessment
-    assessment_result = await db.execute(
-        select(models.Assessment).where(models.Assessment.application_id == application_id)
-    )
-    assessment = assessment_result.scalar_one_or_none()
-
-    # Get financial metrics
-    financial_result = await db.execute(
-        select(models.FinancialMetrics).where(models.FinancialMetrics.application_id == application_id)
-    )
-    financial = financial_result.scalar_one_or_none()
-
-    # Get market analysis
-    market_result = await db.execute(
-        select(models.MarketAnalysis).where(models.MarketAnalysis.application_id == application_id)
-    )
-    market = market_result.scalar_one_or_none()
-
     if not assessment or not financial or not market:
         raise HTTPException(status_code=404, detail="Assessment data not found")
 
-    # Parse nearby businesses
-    nearby_businesses = json.loads(market.nearby_businesses) if market.nearby_businesses else []
+    nearby_businesses = market.nearby_businesses or []
     # Ensure market_density is enum value (low/medium/high) for frontend
     market_density_val = market.market_density if market.market_density in ('low', 'medium', 'high') else 'medium'
 
     # Parse reasoning log for frontend traceability
-    reasoning_log_data = json.loads(assessment.reasoning_log) if getattr(assessment, 'reasoning_log', None) else None
+    reasoning_log_data = orjson.loads(assessment.reasoning_log) if getattr(assessment, 'reasoning_log', None) else None
     reasoning_log_entries = [ReasoningLogEntry(**e) for e in reasoning_log_data] if reasoning_log_data else None
 
-    return AssessmentResponse(
+    response = AssessmentResponse(
         eligibility=Eligibility(assessment.eligibility),
         confidence_score=assessment.confidence_score,
         risk_level=RiskLevel(assessment.risk_level),
         reasoning=assessment.reasoning,
-        recommendations=json.loads(assessment.recommendations),
+        recommendations=assessment.recommendations or [],
         financial_metrics=FinancialMetricsResponse(
             debt_to_income_ratio=financial.debt_to_income_ratio,
             savings_rate=financial.savings_rate,
@@ -492,6 +697,13 @@ async def get_assessment(
         reasoning_log=reasoning_log_entries,
     )
 
+    body = orjson.dumps(response.model_dump(mode="json"))
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    # Skip caching if a re-run started while this read was in flight
+    if _assessment_response_generations.get(application_id) == generation:
+        _assessment_response_cache.set(application_id, (etag, body))
+    return _etag_response(request, etag, body)
+
 
 @router.get("/applications/{application_id}/recommendations", response_model=list[RecommendationResponse])
 async def get_recommendations(
@@ -502,10 +714,7 @@ async def get_recommendations(
     Get personalized recommendations for an application
     """
     # Verify application exists
-    app_result = await db.execute(
-        select(models.Application).where(models.Application.id == application_id)
-    )
-    application = app_result.scalar_one_or_none()
+    application = await db.get(models.Application, application_id)
 
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -521,7 +730,7 @@ async def get_recommendations(
     # Convert to response format
     result = []
     for rec in recommendations:
-        evidence = json.loads(rec.evidence_data) if rec.evidence_data else {}
+        evidence = orjson.loads(rec.evidence_data) if rec.evidence_data else {}
         result.append(RecommendationResponse(
             id=rec.id,
             priority=Priority(rec.priority),
@@ -540,13 +749,12 @@ async def get_recommendations(
 @router.post("/coach/ask", response_model=CoachResponse)
 async def ask_coach(
     request: CoachQuestionRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    orchestrator: Orchestrator = Depends(get_orchestrator)
 ):
     """
     Ask the coach agent a question about assessment
     """
-    from app.agents.coach import CoachAgent
-    from app.agents.llm import get_llm
     from app.core.auth import DummyAuthService
 
     # Get current user (sandbox user for now)
@@ -559,21 +767,17 @@ async def ask_coach(
 
     if request.application_id:
         # Get application
-        app_result = await db.execute(
-            select(models.Application).where(models.Application.id == request.application_id)
-        )
-        application = app_result.scalar_one_or_none()
+        application = await db.get(models.Application, request.application_id)
 
         if application:
             user_job = application.user_job
 
             # Get financial metrics
-            financial_result = await db.execute(
+            financial = await db.scalar(
                 select(models.FinancialMetrics).where(
                     models.FinancialMetrics.application_id == request.application_id
                 )
             )
-            financial = financial_result.scalar_one_or_none()
 
             if financial:
                 financial_data = {
@@ -585,12 +789,11 @@ async def ask_coach(
                 }
 
             # Get assessment
-            assessment_result = await db.execute(
+            assessment = await db.scalar(
                 select(models.Assessment).where(
                     models.Assessment.application_id == request.application_id
                 )
             )
-            assessment = assessment_result.scalar_one_or_none()
 
             if assessment:
                 assessment_data = {
@@ -599,16 +802,16 @@ async def ask_coach(
                     'confidence_score': assessment.confidence_score or 0
                 }
 
-    # Create coach agent and answer question
-    llm = get_llm()
-    coach = CoachAgent(llm)
+    # Serialize context once for both the prompt and the stored session
+    context_json = orjson.dumps(request.context).decode() if request.context else None
 
-    response = await coach.answer_question(
+    # Answer with the shared coach agent
+    response = await orchestrator.coach.answer_question(
         question=request.question,
         financial_data=financial_data,
         assessment_data=assessment_data,
         user_job=user_job,
-        context=request.context
+        context_json=context_json
     )
 
     # Save to database
@@ -619,7 +822,7 @@ async def ask_coach(
         application_id=request.application_id,
         question=request.question,
         response=response['response'],
-        context=json.dumps(request.context) if request.context else None
+        context=context_json
     )
     db.add(db_session)
     await db.commit()
@@ -641,10 +844,7 @@ async def save_action_plan(
     user = DummyAuthService.get_current_user()
 
     # Verify application exists
-    app_result = await db.execute(
-        select(models.Application).where(models.Application.id == plan.application_id)
-    )
-    application = app_result.scalar_one_or_none()
+    application = await db.get(models.Application, plan.application_id)
 
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -657,11 +857,11 @@ async def save_action_plan(
         application_id=plan.application_id,
         timeframe=plan.timeframe,
         action_items=json.dumps([item.model_dump() for item in plan.action_items]),
-        targets=json.dumps([target.model_dump() for target in plan.targets]) if plan.targets else None
+        targets=json.dumps([target.model_dump() for target in plan.targets]) if plan.targets else None,
+        saved_at=datetime.now(timezone.utc)
     )
     db.add(db_plan)
     await db.commit()
-    await db.refresh(db_plan)
 
     return ActionPlanResponse(
         id=db_plan.id,
@@ -710,18 +910,18 @@ async def get_action_plans(
 @router.get("/applications/{application_id}/financial-snapshot", response_model=FinancialSnapshotResponse)
 async def get_financial_snapshot(
     application_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    plaid_service: PlaidService = Depends(get_plaid_service)
 ):
     """
     Get financial snapshot chart data
     """
     # Check if snapshot already exists
-    snapshot_result = await db.execute(
+    snapshot = await db.scalar(
         select(models.FinancialSnapshot).where(
             models.FinancialSnapshot.application_id == application_id
         )
     )
-    snapshot = snapshot_result.scalar_one_or_none()
 
     if snapshot:
         # Return existing snapshot
@@ -732,14 +932,10 @@ async def get_financial_snapshot(
         )
 
     # Generate new snapshot from Plaid data
-    from app.services.plaid_service import PlaidService
     from datetime import timedelta
 
     # Get application
-    app_result = await db.execute(
-        select(models.Application).where(models.Application.id == application_id)
-    )
-    application = app_result.scalar_one_or_none()
+    application = await db.get(models.Application, application_id)
 
     if not application or not application.plaid_access_token:
         raise HTTPException(status_code=404, detail="Application or Plaid data not found")
@@ -748,11 +944,10 @@ async def get_financial_snapshot(
     access_token = decrypt_token(application.plaid_access_token)
 
     # Get transactions
-    plaid_service = PlaidService()
     end_date = datetime.now()
     start_date = end_date - timedelta(days=60)
 
-    transactions_result = plaid_service.get_transactions(
+    transactions_result = await plaid_service.aget_transactions(
         access_token=access_token,
         start_date=start_date,
         end_date=end_date
@@ -845,9 +1040,22 @@ async def get_financial_snapshot(
     )
 
 
+# Health probes hit this endpoint constantly; the body is rebuilt at most
+# once a second instead of formatting a timestamp on every call
+_HEALTH_REFRESH_SECONDS = 1.0
+_health_body = b""
+_health_built_at = float("-inf")
+
+
 @router.get("/health")
 async def health_check():
     """
     Health check endpoint
     """
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    global _health_body, _health_built_at
+
+    now = time.monotonic()
+    if now - _health_built_at >= _HEALTH_REFRESH_SECONDS:
+        _health_body = orjson.dumps({"status": "healthy", "timestamp": datetime.utcnow().isoformat()})
+        _health_built_at = now
+    return Response(content=_health_body, media_type="application/json")
@@ -0,0 +1,108 @@
+"""
+In-process caching utilities
+
+A small LRU cache with per-entry expiry, used to skip repeated external
+calls (LLM, Google Places, ...) for identical inputs within one process.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries expire after a fixed TTL
+
+    Guarded by a lock so it can also be shared with blocking service calls
+    running in worker threads (asyncio.to_thread).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        """
+        Initialize cache
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the LRU one
+            ttl: Seconds an entry stays valid after being stored
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss or expired entry
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Optional TTL override in seconds
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove an entry if present
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from JSON-serializable parts
+
+    Dicts are serialized with sorted keys so logically equal inputs map to
+    the same key regardless of insertion order.
+
+    Args:
+        *parts: Values identifying the cached computation
+
+    Returns:
+        Hex digest of the canonical serialization
+    """
+    canonical = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
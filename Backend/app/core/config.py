@@ -15,6 +15,36 @@ class Settings(BaseSettings):
     # Configuration
     PLAID_ENV: str = "sandbox"
     DATABASE_URL: str = "sqlite+aiosqlite:///./loan_assessment.db"
+    # Keep-alive connections per upstream host (Plaid, Google Maps/Places)
+    HTTP_POOL_MAXSIZE: int = 100
+    LLM_TIMEOUT_SECONDS: float = 120.0
+    # Gemini models: general agents, and the short structured risk decision
+    GEMINI_MODEL: str = "gemini-3-pro-preview"
+    GEMINI_FAST_MODEL: str = "gemini-3-flash-preview"
+    # How long Google Places nearby-search results are reused
+    PLACES_CACHE_TTL_SECONDS: int = 86400
+    # How long Plaid transactions and balances are reused per linked account
+    PLAID_CACHE_TTL_SECONDS: int = 3600
+    # How long identical risk-assessment prompts reuse the model's answer (0 disables)
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 3600
+    # How long a completed application's serialized assessment is served from memory
+    ASSESSMENT_RESPONSE_CACHE_TTL_SECONDS: int = 86400
+    # Gemini calls in flight per process, and attempts per call on rate limits
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_MAX_RETRIES: int = 5
+    # Per-agent time budgets in the orchestrator; an agent that overruns
+    # falls back to its default result
+    FINANCIAL_AGENT_TIMEOUT_SECONDS: float = 15.0
+    MARKET_AGENT_TIMEOUT_SECONDS: float = 10.0
+    RISK_AGENT_TIMEOUT_SECONDS: float = 45.0
+    COACH_AGENT_TIMEOUT_SECONDS: float = 60.0
+    # Risk assessments arriving within the wait window share one combined
+    # Gemini prompt; 1 disables batching
+    RISK_BATCH_MAX_SIZE: int = 1
+    RISK_BATCH_MAX_WAIT_MS: int = 25
+    # Send a one-off Gemini request at startup to open its connection
+    LLM_WARMUP_ON_STARTUP: bool = True
+    LOG_LEVEL: str = "INFO"
     CORS_ORIGINS: str = (
         "http://localhost:8080,http://127.0.0.1:8080,"
         "http://localhost:5173,http://127.0.0.1:5173,"
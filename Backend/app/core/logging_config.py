@@ -0,0 +1,60 @@
+"""
+Application logging setup
+
+Log records are handed to a queue on the calling thread and written to
+stderr by a background listener thread, so handler I/O never blocks the
+asyncio event loop.
+"""
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: str = "INFO") -> QueueListener:
+    """
+    Route root logger output through a queue and start the writer thread
+
+    Safe to call more than once; later calls only update the level.
+
+    Args:
+        level: Root log level name (e.g. "INFO", "DEBUG")
+
+    Returns:
+        QueueListener: The running listener (stop it with shutdown_logging)
+    """
+    global _listener
+
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+
+    if _listener is None:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        # Replace direct handlers so every record goes through the queue
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(QueueHandler(log_queue))
+
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+
+    return _listener
+
+
+def shutdown_logging():
+    """
+    Flush queued records and stop the writer thread
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
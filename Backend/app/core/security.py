@@ -1,6 +1,12 @@
 from cryptography.fernet import Fernet
+from app.core.cache import TTLCache
 from app.core.config import settings, Settings
 
+# Recently decrypted tokens keyed by ciphertext, so repeat assessments and
+# snapshot refreshes of one application skip the Fernet HMAC check and AES
+# decrypt. Kept short-lived to limit how long plaintext tokens stay in memory.
+_decrypted_tokens = TTLCache(maxsize=1024, ttl=300)
+
 
 class Encryptor:
     """Handles encryption/decryption of sensitive data like Plaid tokens"""
@@ -55,6 +61,10 @@ def decrypt_token(encrypted_token: str) -> str:
     Returns:
         Decrypted token
     """
-    if encryptor is None:
-        raise ValueError("Encryptor not initialized")
-    return encryptor.decrypt(encrypted_token)
+    token = _decrypted_tokens.get(encrypted_token)
+    if token is None:
+        if encryptor is None:
+            raise ValueError("Encryptor not initialized")
+        token = encryptor.decrypt(encrypted_token)
+        _decrypted_tokens.set(encrypted_token, token)
+    return token
@@ -1,7 +1,12 @@
-from sqlalchemy import Column, String, Integer, Float, Text, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, String, Integer, Float, Text, ForeignKey, DateTime, Boolean, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from app.database.base import Base
 
+# Structured pipeline output: native JSONB on Postgres, JSON text elsewhere
+# (SQLite); either way SQLAlchemy hands back Python objects
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 
 class User(Base):
     __tablename__ = "users"
@@ -26,7 +31,7 @@ class Application(Base):
     loan_amount = Column(Float, nullable=False)
     loan_purpose = Column(String, nullable=False)
     plaid_access_token = Column(String, nullable=True)  # Encrypted
-    status = Column(String, nullable=False)  # pending_plaid, processing, completed
+    status = Column(String, nullable=False)  # pending_plaid, processing, completed, failed
     # Additional fields for frontend integration
     business_name = Column(String, nullable=True)
     business_type = Column(String, nullable=True)
@@ -46,7 +51,7 @@ class FinancialMetrics(Base):
     __tablename__ = "financial_metrics"
 
     id = Column(String, primary_key=True)
-    application_id = Column(String, ForeignKey("applications.id"), nullable=False)
+    application_id = Column(String, ForeignKey("applications.id"), nullable=False, unique=True, index=True)
     debt_to_income_ratio = Column(Float, nullable=True)
     savings_rate = Column(Float, nullable=True)
     avg_monthly_balance = Column(Float, nullable=True)
@@ -55,7 +60,7 @@ class FinancialMetrics(Base):
     income_stability_score = Column(Float, nullable=True)
     monthly_income = Column(Float, nullable=True)
     monthly_expenses = Column(Float, nullable=True)
-    raw_plaid_data = Column(Text, nullable=True)  # JSON blob
+    raw_plaid_data = Column(JSONDocument, nullable=True)
     calculated_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
@@ -63,12 +68,12 @@ class MarketAnalysis(Base):
     __tablename__ = "market_analysis"
 
     id = Column(String, primary_key=True)
-    application_id = Column(String, ForeignKey("applications.id"), nullable=False)
+    application_id = Column(String, ForeignKey("applications.id"), nullable=False, unique=True, index=True)
     competitor_count = Column(Integer, nullable=True)
     market_density = Column(String, nullable=True)  # low, medium, high
     viability_score = Column(Float, nullable=True)
     market_insights = Column(Text, nullable=True)
-    nearby_businesses = Column(Text, nullable=True)  # JSON array
+    nearby_businesses = Column(JSONDocument, nullable=True)  # list of businesses
     analyzed_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
@@ -76,12 +81,12 @@ class Assessment(Base):
     __tablename__ = "assessments"
 
     id = Column(String, primary_key=True)
-    application_id = Column(String, ForeignKey("applications.id"), nullable=False)
+    application_id = Column(String, ForeignKey("applications.id"), nullable=False, unique=True, index=True)
     eligibility = Column(String, nullable=False)  # approved, denied, review
     confidence_score = Column(Float, nullable=True)
     risk_level = Column(String, nullable=True)  # low, medium, high
     reasoning = Column(Text, nullable=True)
-    recommendations = Column(Text, nullable=True)  # JSON array
+    recommendations = Column(JSONDocument, nullable=True)  # list of strings
     reasoning_log = Column(Text, nullable=True)  # JSON array of {agent, message, timestamp, severity}
     assessed_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -90,7 +95,7 @@ class Recommendation(Base):
     __tablename__ = "recommendations"
 
     id = Column(String, primary_key=True)
-    application_id = Column(String, ForeignKey("applications.id"), nullable=False)
+    application_id = Column(String, ForeignKey("applications.id"), nullable=False, index=True)
     priority = Column(String, nullable=False)  # high, medium, low
     category = Column(String, nullable=False)
     title = Column(String, nullable=False)
@@ -106,7 +111,7 @@ class ActionPlan(Base):
     __tablename__ = "action_plans"
 
     id = Column(String, primary_key=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     application_id = Column(String, ForeignKey("applications.id"), nullable=False)
     timeframe = Column(String, nullable=False)  # 30/60/90
     action_items = Column(Text, nullable=False)  # JSON array
@@ -119,7 +124,7 @@ class FinancialSnapshot(Base):
     __tablename__ = "financial_snapshots"
 
     id = Column(String, primary_key=True)
-    application_id = Column(String, ForeignKey("applications.id"), nullable=False)
+    application_id = Column(String, ForeignKey("applications.id"), nullable=False, index=True)
     cash_flow_data = Column(Text, nullable=True)  # JSON array
     spending_by_category = Column(Text, nullable=True)  # JSON array
     stability_trend = Column(Text, nullable=True)  # JSON array
@@ -1,3 +1,4 @@
+import orjson
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import get_settings
@@ -6,11 +7,19 @@ from app.database.base import Base
 # Get settings
 settings = get_settings()
 
+
+def _json_serializer(obj) -> str:
+    """Encode JSON columns with orjson (non-string dict keys allowed)"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=True,
-    future=True
+    future=True,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
 )
 
 # Create async session factory
@@ -1,14 +1,65 @@
+import asyncio
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
+from app.agents.orchestrator import get_orchestrator
 from app.api.routes import router
 from app.api.auth_routes import router as auth_router
 from app.database.base import Base
 from app.database.session import engine
 from app.core.config import get_settings
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.services.google_service import get_google_service
+from app.services.plaid_service import get_plaid_service
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+async def warm_up():
+    """
+    Build shared agents and API clients before the first request
+
+    Constructs the orchestrator, imports the Plaid SDK and creates the
+    Plaid/Google clients, then optionally pings Gemini to open its
+    connection, so the first assessment does not pay the cold start.
+    Failures are logged and left to surface on the real request.
+    """
+    try:
+        orchestrator = get_orchestrator()
+        await asyncio.to_thread(get_plaid_service()._get_client)
+        google_service = get_google_service()
+        google_service._get_maps_client()
+        google_service._get_places_client()
+    except Exception as e:
+        logger.warning(f"Startup warm-up failed: {e}")
+        return
+
+    if settings.LLM_WARMUP_ON_STARTUP:
+        try:
+            await asyncio.wait_for(orchestrator.risk_assessor.llm.ainvoke("ping"), timeout=5.0)
+        except Exception as e:
+            logger.warning(f"Gemini warm-up failed: {e}")
+
+
+class EventStreamAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZip responses except server-sent event streams
+
+    Compressing an event stream would hold events in the compressor's
+    buffer instead of flushing each one to the client.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/events"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
 
 
 @asynccontextmanager
@@ -16,24 +67,40 @@ async def lifespan(app: FastAPI):
     """
     Startup and shutdown events
     """
-    # Startup: Create database tables
+    # Startup: Move log output off the event loop thread
+    setup_logging(settings.LOG_LEVEL)
+
+    # Create database tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    # Warm agents and clients in the background so startup is not delayed
+    warm_up_task = asyncio.create_task(warm_up())
+
     yield
 
+    warm_up_task.cancel()
+
     # Shutdown: Close database connections
     await engine.dispose()
 
+    # Flush any queued log records
+    shutdown_logging()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Loan Assessment API",
     description="AI-powered loan assessment platform using multi-agent system",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Render every JSON response with orjson instead of stdlib json
+    default_response_class=ORJSONResponse
 )
 
+# Compress larger JSON bodies (assessment results, snapshots) on the wire
+app.add_middleware(EventStreamAwareGZipMiddleware, minimum_size=500)
+
 # Configure CORS: explicit origins from config + regex for any localhost/127.0.0.1 port
 _app_origins = settings.cors_origins_list if settings else []
 # Allow any origin like http://localhost:PORT or http://127.0.0.1:PORT (dev servers often use different ports)
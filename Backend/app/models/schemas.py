@@ -9,6 +9,7 @@ class ApplicationStatus(str, Enum):
     PENDING_PLAID = "pending_plaid"
     PROCESSING = "processing"
     COMPLETED = "completed"
+    FAILED = "failed"
 
 
 class Eligibility(str, Enum):
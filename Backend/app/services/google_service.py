@@ -1,10 +1,17 @@
+import asyncio
 import googlemaps
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any, Optional
 from math import radians, sin, cos, sqrt, atan2
 from app.core.config import get_settings
+from app.core.cache import TTLCache
 
 settings = get_settings()
 
+# Raw Places nearby-search results keyed on a ~100m grid (coordinates rounded
+# to 3 decimals), so repeat assessments in the same neighbourhood skip the API
+_places_cache = TTLCache(maxsize=4096, ttl=settings.PLACES_CACHE_TTL_SECONDS)
+
 
 class GoogleService:
     """Service for interacting with Google Maps/Places API"""
@@ -14,16 +21,25 @@ class GoogleService:
         self.places_client = None
         self.api_key = settings.GOOGLE_MAPS_API_KEY
 
+    @staticmethod
+    def _create_client(key: str) -> googlemaps.Client:
+        """Create a googlemaps client whose HTTP session keeps a larger keep-alive pool"""
+        client = googlemaps.Client(key=key)
+        session = getattr(client, 'session', None)
+        if session is not None:
+            session.mount('https://', HTTPAdapter(pool_maxsize=settings.HTTP_POOL_MAXSIZE))
+        return client
+
     def _get_maps_client(self):
         """Lazy initialization of Google Maps client"""
         if not self.maps_client:
-            self.maps_client = googlemaps.Client(key=self.api_key)
+            self.maps_client = self._create_client(self.api_key)
         return self.maps_client
 
     def _get_places_client(self):
         """Lazy initialization of Google Places client"""
         if not self.places_client:
-            self.places_client = googlemaps.Client(key=settings.GOOGLE_PLACES_API_KEY)
+            self.places_client = self._create_client(settings.GOOGLE_PLACES_API_KEY)
         return self.places_client
 
     def get_nearby_businesses(
@@ -45,16 +61,20 @@ class GoogleService:
         Returns:
             List of nearby businesses with details
         """
-        client = self._get_places_client()
-
-        response = client.places_nearby(
-            location=(lat, lng),
-            radius=radius,
-            type=business_type
-        )
+        cache_key = (business_type, round(lat, 3), round(lng, 3), radius)
+        places = _places_cache.get(cache_key)
+        if places is None:
+            client = self._get_places_client()
+            response = client.places_nearby(
+                location=(lat, lng),
+                radius=radius,
+                type=business_type
+            )
+            places = response.get('results', [])
+            _places_cache.set(cache_key, places)
 
         businesses = []
-        for place in response.get('results', []):
+        for place in places:
             # Calculate distance from center point
             place_lat = place['geometry']['location']['lat']
             place_lng = place['geometry']['location']['lng']
@@ -71,6 +91,30 @@ class GoogleService:
 
         return businesses
 
+    async def aget_nearby_businesses(
+        self,
+        lat: float,
+        lng: float,
+        business_type: str,
+        radius: int = 2000
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of get_nearby_businesses
+
+        The googlemaps client is blocking, so the call runs in a worker
+        thread and does not stall the event loop.
+
+        Args:
+            lat: Latitude
+            lng: Longitude
+            business_type: Type of business (e.g., 'cafe', 'restaurant')
+            radius: Search radius in meters (default 2000m)
+
+        Returns:
+            List of nearby businesses with details
+        """
+        return await asyncio.to_thread(self.get_nearby_businesses, lat, lng, business_type, radius)
+
     def analyze_market_density(
         self,
         nearby_businesses: List[Dict],
@@ -216,3 +260,23 @@ class GoogleService:
             data = dict(data)
             data["address_components"] = data.pop("address_component", [])
         return data
+
+
+# Shared service instance so its API clients (and their connection pools)
+# are reused across requests
+_google_service_instance = None
+
+
+def get_google_service() -> GoogleService:
+    """
+    Get or create shared GoogleService instance
+
+    Returns:
+        GoogleService: Shared Google Maps/Places service
+    """
+    global _google_service_instance
+
+    if _google_service_instance is None:
+        _google_service_instance = GoogleService()
+
+    return _google_service_instance
@@ -1,9 +1,24 @@
-from datetime import datetime
-from typing import Dict, Any, Optional
+import asyncio
+import hashlib
+from datetime import date, datetime
+from typing import Dict, Any
 from app.core.config import get_settings
+from app.core.cache import TTLCache
 
 settings = get_settings()
 
+# Normalized transaction and balance responses keyed on a hash of the access
+# token (never the token itself), so re-assessments of the same linked
+# account skip the Plaid round-trips. Transactions are also keyed on the
+# requested date range, which moves daily.
+_transactions_cache = TTLCache(maxsize=1024, ttl=settings.PLAID_CACHE_TTL_SECONDS)
+_balance_cache = TTLCache(maxsize=1024, ttl=settings.PLAID_CACHE_TTL_SECONDS)
+
+
+def _token_key(access_token: str) -> str:
+    """Hash an access token for use in cache keys"""
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
 
 class PlaidService:
     """Service for interacting with Plaid API"""
@@ -14,6 +29,7 @@ class PlaidService:
         self.client_id = settings.PLAID_CLIENT_ID
         self.secret = settings.PLAID_SECRET
         self.environment = settings.PLAID_ENV
+        self.client = None
 
     def _get_plaid_environment(self):
         """Map PLAID_ENV string to Plaid Environment enum"""
@@ -25,6 +41,30 @@ class PlaidService:
         }
         return env_map.get(self.environment.lower(), plaid.Environment.Sandbox)
 
+    def _get_client(self):
+        """
+        Lazy initialization of the Plaid API client
+
+        The client (and its underlying connection pool) is reused across calls
+        so concurrent requests share keep-alive connections instead of opening
+        a new TLS session each time.
+        """
+        if not self.client:
+            # Import here to avoid import errors
+            import plaid
+            from plaid.api import plaid_api
+
+            configuration = plaid.Configuration(
+                host=self._get_plaid_environment(),
+                api_key={
+                    'clientId': self.client_id,
+                    'secret': self.secret,
+                }
+            )
+            configuration.connection_pool_maxsize = settings.HTTP_POOL_MAXSIZE
+            self.client = plaid_api.PlaidApi(plaid.ApiClient(configuration))
+        return self.client
+
     def exchange_public_token(self, public_token: str) -> str:
         """
         Exchange public token for access token
@@ -35,60 +75,53 @@ class PlaidService:
         Returns:
             Access token for API calls
         """
-        # Import here to avoid import errors
-        import plaid
-        from plaid.api import plaid_api
-
-        configuration = plaid.Configuration(
-            host=self._get_plaid_environment(),
-            api_key={
-                'clientId': self.client_id,
-                'secret': self.secret,
-            }
-        )
-        api_client = plaid.ApiClient(configuration)
-        client = plaid_api.PlaidApi(api_client)
+        client = self._get_client()
 
         # Create request using dict
         request = {'public_token': public_token}
         response = client.item_public_token_exchange(request)
         return response['access_token']
 
+    async def aexchange_public_token(self, public_token: str) -> str:
+        """
+        Async variant of exchange_public_token (runs in a worker thread)
+
+        Args:
+            public_token: Public token from Plaid Link
+
+        Returns:
+            Access token for API calls
+        """
+        return await asyncio.to_thread(self.exchange_public_token, public_token)
+
     def get_transactions(
         self,
         access_token: str,
-        start_date: datetime,
-        end_date: datetime
+        start_date: date,
+        end_date: date
     ) -> Dict[str, Any]:
         """
         Fetch transactions for a given date range
 
         Args:
             access_token: Plaid access token
-            start_date: Start date for transactions
-            end_date: End date for transactions
+            start_date: Start date for transactions (a datetime is truncated to its date)
+            end_date: End date for transactions (a datetime is truncated to its date)
 
         Returns:
             Dictionary containing transactions
         """
-        import plaid
-        from plaid.api import plaid_api
-
-        configuration = plaid.Configuration(
-            host=self._get_plaid_environment(),
-            api_key={
-                'clientId': self.client_id,
-                'secret': self.secret,
-            }
-        )
-        api_client = plaid.ApiClient(configuration)
-        client = plaid_api.PlaidApi(api_client)
-
         request = {
             'access_token': access_token,
-            'start_date': start_date.date(),
-            'end_date': end_date.date()
+            'start_date': start_date.date() if isinstance(start_date, datetime) else start_date,
+            'end_date': end_date.date() if isinstance(end_date, datetime) else end_date
         }
+        cache_key = (_token_key(access_token), request['start_date'], request['end_date'])
+        cached = _transactions_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        client = self._get_client()
         # In Sandbox it's common for transactions to be briefly unavailable right after link/exchange.
         # Plaid returns ITEM_ERROR/PRODUCT_NOT_READY; the recommended action is to retry later.
         import time
@@ -143,7 +176,43 @@ class PlaidService:
                 'category': list(category) if isinstance(category, (list, tuple)) else [],
                 'name': str(name) if name else '',
             })
-        return {'transactions': transactions, 'total_transactions': total}
+        result = {'transactions': transactions, 'total_transactions': total}
+        _transactions_cache.set(cache_key, result)
+        return result
+
+    async def aget_transactions(
+        self,
+        access_token: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Any]:
+        """
+        Async variant of get_transactions
+
+        The Plaid SDK is blocking, so the call runs in a worker thread and
+        does not stall the event loop.
+
+        Args:
+            access_token: Plaid access token
+            start_date: Start date for transactions
+            end_date: End date for transactions
+
+        Returns:
+            Dictionary containing transactions
+        """
+        return await asyncio.to_thread(self.get_transactions, access_token, start_date, end_date)
+
+    async def aget_balance(self, access_token: str) -> Dict[str, Any]:
+        """
+        Async variant of get_balance (runs in a worker thread)
+
+        Args:
+            access_token: Plaid access token
+
+        Returns:
+            Dictionary containing account balances
+        """
+        return await asyncio.to_thread(self.get_balance, access_token)
 
     def get_balance(self, access_token: str) -> Dict[str, Any]:
         """
@@ -155,18 +224,12 @@ class PlaidService:
         Returns:
             Dictionary containing account balances
         """
-        import plaid
-        from plaid.api import plaid_api
-
-        configuration = plaid.Configuration(
-            host=self._get_plaid_environment(),
-            api_key={
-                'clientId': self.client_id,
-                'secret': self.secret,
-            }
-        )
-        api_client = plaid.ApiClient(configuration)
-        client = plaid_api.PlaidApi(api_client)
+        cache_key = _token_key(access_token)
+        cached = _balance_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        client = self._get_client()
 
         request = {'access_token': access_token}
         try:
@@ -186,7 +249,9 @@ class PlaidService:
                 'account_id': getattr(acc, 'account_id', ''),
                 'balances': {'current': float(current) if current is not None else 0.0},
             })
-        return {'accounts': accounts}
+        result = {'accounts': accounts}
+        _balance_cache.set(cache_key, result)
+        return result
 
     def get_income(self, access_token: str) -> Dict[str, Any]:
         """
@@ -198,18 +263,7 @@ class PlaidService:
         Returns:
             Dictionary containing income data
         """
-        import plaid
-        from plaid.api import plaid_api
-
-        configuration = plaid.Configuration(
-            host=self._get_plaid_environment(),
-            api_key={
-                'clientId': self.client_id,
-                'secret': self.secret,
-            }
-        )
-        api_client = plaid.ApiClient(configuration)
-        client = plaid_api.PlaidApi(api_client)
+        client = self._get_client()
 
         request = {'access_token': access_token}
         response = client.income_get(request)
@@ -225,18 +279,7 @@ class PlaidService:
         Returns:
             Link token for Plaid Link
         """
-        import plaid
-        from plaid.api import plaid_api
-
-        configuration = plaid.Configuration(
-            host=self._get_plaid_environment(),
-            api_key={
-                'clientId': self.client_id,
-                'secret': self.secret,
-            }
-        )
-        api_client = plaid.ApiClient(configuration)
-        client = plaid_api.PlaidApi(api_client)
+        client = self._get_client()
 
         request = {
             'products': ['transactions', 'auth'],
@@ -248,6 +291,18 @@ class PlaidService:
         response = client.link_token_create(request)
         return response['link_token']
 
+    async def acreate_link_token(self, user_id: str) -> str:
+        """
+        Async variant of create_link_token (runs in a worker thread)
+
+        Args:
+            user_id: Unique identifier for the user
+
+        Returns:
+            Link token for Plaid Link
+        """
+        return await asyncio.to_thread(self.create_link_token, user_id)
+
     def create_sandbox_public_token(self, institution_id: str = 'ins_109508') -> str:
         """
         Create a sandbox public token for testing (no real Link flow).
@@ -258,18 +313,7 @@ class PlaidService:
         Returns:
             Public token that can be exchanged for access token
         """
-        import plaid
-        from plaid.api import plaid_api
-
-        configuration = plaid.Configuration(
-            host=self._get_plaid_environment(),
-            api_key={
-                'clientId': self.client_id,
-                'secret': self.secret,
-            }
-        )
-        api_client = plaid.ApiClient(configuration)
-        client = plaid_api.PlaidApi(api_client)
+        client = self._get_client()
 
         request = {
             'institution_id': institution_id,
@@ -277,3 +321,35 @@ class PlaidService:
         }
         response = client.sandbox_public_token_create(request)
         return response['public_token']
+
+    async def acreate_sandbox_public_token(self, institution_id: str = 'ins_109508') -> str:
+        """
+        Async variant of create_sandbox_public_token (runs in a worker thread)
+
+        Args:
+            institution_id: Plaid sandbox institution ID (default ins_109508)
+
+        Returns:
+            Public token that can be exchanged for access token
+        """
+        return await asyncio.to_thread(self.create_sandbox_public_token, institution_id)
+
+
+# Shared service instance so its API clients (and their connection pools)
+# are reused across requests
+_plaid_service_instance = None
+
+
+def get_plaid_service() -> PlaidService:
+    """
+    Get or create shared PlaidService instance
+
+    Returns:
+        PlaidService: Shared Plaid service
+    """
+    global _plaid_service_instance
+
+    if _plaid_service_instance is None:
+        _plaid_service_instance = PlaidService()
+
+    return _plaid_service_instance
@@ -1,6 +1,11 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
 import httpx
 from app.main import app
+from app.api import routes
+from app.models.schemas import ApplicationStatus
 
 # AsyncClient + ASGITransport (sync Client not supported with async transport in current httpx)
 transport = httpx.ASGITransport(app=app)
@@ -39,3 +44,60 @@ def test_create_application_endpoint_exists():
         p = getattr(r, "path", None) or getattr(r, "path_regex", None)
         return p and s in str(p)
     assert any(path_contains(r, "application") for r in app.routes)
+
+
+@pytest.mark.asyncio
+async def test_failed_background_assessment_marks_application_failed():
+    """Test a raising assessment run ends in the failed state and wakes /events waiters"""
+    application = MagicMock(status=ApplicationStatus.PROCESSING.value)
+    session = AsyncMock()
+    session.get.return_value = application
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = session
+
+    waiter = asyncio.Event()
+    routes._assessment_waiters["app-failed"] = {waiter}
+    routes._assessment_response_cache.set("app-failed", ('"stale"', b"{}"))
+
+    with patch.object(routes, "AsyncSessionLocal", session_factory), \
+            patch.object(routes, "process_assessment", AsyncMock(side_effect=RuntimeError("LLM down"))):
+        await routes.run_assessment_in_background("app-failed")
+
+    assert application.status == ApplicationStatus.FAILED.value
+    session.commit.assert_awaited()
+    assert waiter.is_set()
+    assert "app-failed" not in routes._assessment_waiters
+    assert routes._assessment_response_cache.get("app-failed") is None
+
+
+@pytest.mark.asyncio
+async def test_assessment_read_overlapping_rerun_is_not_cached():
+    """Test a read that saw the old completed row does not cache it once a re-run has started"""
+    application = MagicMock(status=ApplicationStatus.COMPLETED.value)
+    assessment = MagicMock(
+        eligibility="approved", confidence_score=0.9, risk_level="low", reasoning="Solid",
+        recommendations=[], assessed_at=None, reasoning_log=None
+    )
+    financial = MagicMock(
+        debt_to_income_ratio=20.0, savings_rate=15.0, avg_monthly_balance=5000.0, min_balance_6mo=1000.0,
+        overdraft_count=0, income_stability_score=80.0, monthly_income=8000.0, monthly_expenses=6000.0
+    )
+    market = MagicMock(
+        competitor_count=3, market_density="low", viability_score=75.0, market_insights="", nearby_businesses=[]
+    )
+
+    async def execute_during_rerun(statement):
+        # /plaid-connect commits PROCESSING and invalidates while this read is in flight
+        routes._invalidate_assessment_response("app-rerun")
+        result = MagicMock()
+        result.first.return_value = (application, assessment, financial, market)
+        return result
+
+    db = AsyncMock()
+    db.execute.side_effect = execute_during_rerun
+    request = MagicMock(headers={})
+
+    response = await routes.get_assessment("app-rerun", request, db)
+
+    assert response.status_code == 200
+    assert routes._assessment_response_cache.get("app-rerun") is None
@@ -0,0 +1,55 @@
+"""
+Unit tests for LLM request micro-batching
+"""
+import asyncio
+
+import pytest
+
+from app.agents.batching import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_share_one_dispatch():
+    """Test items submitted within the wait window are dispatched together"""
+    calls = []
+
+    async def dispatch(items):
+        calls.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(dispatch, max_batch=8, max_wait=0.01)
+
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+    assert results == [0, 10, 20]
+    assert calls == [[0, 1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_dispatches_without_waiting():
+    """Test a batch is dispatched as soon as it reaches max_batch"""
+    calls = []
+
+    async def dispatch(items):
+        calls.append(list(items))
+        return items
+
+    batcher = MicroBatcher(dispatch, max_batch=2, max_wait=10)
+
+    results = await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(4))), timeout=1)
+
+    assert results == [0, 1, 2, 3]
+    assert calls == [[0, 1], [2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_error_reaches_every_caller():
+    """Test a failed dispatch raises in each caller of the batch"""
+    async def dispatch(items):
+        raise RuntimeError("upstream down")
+
+    batcher = MicroBatcher(dispatch, max_batch=8, max_wait=0.01)
+
+    results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,22 @@
+import pytest
+from app.agents.business_types import extract_business_type
+
+
+@pytest.mark.parametrize("user_job,expected", [
+    ("Coffee shop owner", "cafe"),
+    ("Shop selling coffee and pastries", "cafe"),
+    ("Family restaurants", "restaurant"),
+    ("Hair Salon", "beauty_salon"),
+    ("Neighbourhood pub", "bar"),
+    ("Bakery", "bakery"),
+    ("Retailer", "store"),
+    ("Bookstore owner", "store"),
+    ("Coffeeshop", "cafe"),
+    ("Barbershop owner", "store"),
+    ("Two bookstores downtown", "store"),
+    ("Embarrassed to ask", "establishment"),
+    ("Freelance software developer", "establishment"),
+])
+def test_extract_business_type(user_job, expected):
+    """Test job descriptions map to Google Places types by keyword priority"""
+    assert extract_business_type(user_job) == expected
@@ -0,0 +1,59 @@
+"""
+Unit tests for in-process cache utilities
+"""
+from unittest.mock import patch
+
+from app.core.cache import TTLCache, make_cache_key
+
+
+def test_ttl_cache_get_and_set():
+    """Test values round-trip and misses return the default"""
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set('a', 1)
+
+    assert cache.get('a') == 1
+    assert cache.get('missing', 'default') == 'default'
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test the least recently used entry is evicted at capacity"""
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_ttl_cache_expires_entries():
+    """Test entries are dropped once their TTL has passed"""
+    cache = TTLCache(maxsize=2, ttl=10)
+
+    with patch('app.core.cache.time.monotonic', return_value=100.0):
+        cache.set('a', 1)
+    with patch('app.core.cache.time.monotonic', return_value=111.0):
+        assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_delete_removes_entry():
+    """Test deleted keys miss and deleting a missing key is a no-op"""
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set('a', 1)
+    cache.delete('a')
+    cache.delete('missing')
+
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_make_cache_key_ignores_dict_order():
+    """Test logically equal inputs produce the same key"""
+    assert make_cache_key('q', {'a': 1, 'b': 2}) == make_cache_key('q', {'b': 2, 'a': 1})
+    assert make_cache_key('q', {'a': 1}) != make_cache_key('q', {'a': 2})
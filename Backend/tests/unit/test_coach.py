@@ -0,0 +1,95 @@
+"""
+Unit tests for CoachAgent
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.agents.coach.agent import CoachAgent, _answer_cache
+
+
+@pytest.fixture
+def llm():
+    """Mock LLM whose structured-output runnable is shared across binds"""
+    _answer_cache.clear()
+    return MagicMock()
+
+
+def _ask(coach):
+    return coach.answer_question(
+        question="How can I improve my savings rate?",
+        financial_data={'savings_rate': 8.0},
+        assessment_data={'eligibility': 'review'},
+        user_job="Coffee shop owner"
+    )
+
+
+@pytest.mark.asyncio
+async def test_answer_question_cache_returns_independent_copies(llm):
+    """Test a cached answer is served without the LLM and cannot be mutated by callers"""
+    llm.with_structured_output.return_value.ainvoke = AsyncMock(return_value={
+        'response': 'Set aside a fixed share of revenue.',
+        'action_steps': ['Open a savings account'],
+        'expected_impact': 'Higher savings rate'
+    })
+    coach = CoachAgent(llm=llm)
+
+    first = await _ask(coach)
+    first['action_steps'].append('mutated')
+    second = await _ask(coach)
+
+    assert second['action_steps'] == ['Open a savings account']
+    assert llm.with_structured_output.return_value.ainvoke.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_answer_question_does_not_cache_unparseable_reply(llm):
+    """Test a reply with no JSON answer is returned but retried on the next ask"""
+    llm.with_structured_output.return_value.ainvoke = AsyncMock(side_effect=ValueError("schema mismatch"))
+    llm.ainvoke = AsyncMock(return_value=MagicMock(content="Sorry, something went wrong"))
+    coach = CoachAgent(llm=llm)
+
+    first = await _ask(coach)
+    await _ask(coach)
+
+    assert first['response'] == "Sorry, something went wrong"
+    assert llm.ainvoke.await_count == 2
+
+
+def _applicant(applicant_id, debt_to_income_ratio):
+    return {
+        'applicant_id': applicant_id,
+        'financial_data': {'debt_to_income_ratio': debt_to_income_ratio, 'overdraft_count': 0, 'savings_rate': 10.0},
+        'market_data': {'viability_score': 60.0},
+        'assessment_data': {'eligibility': 'review'},
+        'user_job': "Coffee shop owner",
+        'user_age': 35,
+        'loan_amount': 50000.0,
+        'loan_purpose': "Equipment"
+    }
+
+
+@pytest.mark.asyncio
+async def test_generate_recommendations_batch_maps_results_and_defaults_missing(llm):
+    """Test batch results are matched by applicant_id and skipped applicants get defaults"""
+    recommendation = {
+        'priority': 'HIGH',
+        'category': 'Cash Flow',
+        'title': 'Build a reserve',
+        'evidence_summary': '',
+        'why_matters': '',
+        'recommended_action': '',
+        'expected_impact': ''
+    }
+    llm.with_structured_output.return_value.ainvoke = AsyncMock(return_value={
+        'results': [{'applicant_id': 'a', 'recommendations': [recommendation]}]
+    })
+    coach = CoachAgent(llm=llm)
+
+    results = await coach.generate_recommendations_batch([_applicant('a', 30.0), _applicant('b', 55.0)])
+
+    assert results[0] == [recommendation]
+    assert results[1] == coach._get_default_recommendations(
+        {'debt_to_income_ratio': 55.0, 'overdraft_count': 0, 'savings_rate': 10.0},
+        {'viability_score': 60.0}
+    )
+    assert results[1][0]['title'] == 'Reduce Debt-to-Income Ratio'
@@ -1,11 +1,12 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from app.services.google_service import GoogleService
+from app.services.google_service import GoogleService, _places_cache
 
 
 @pytest.fixture
 def google_service():
     """Create GoogleService instance"""
+    _places_cache.clear()
     return GoogleService()
 
 
@@ -57,6 +58,45 @@ def test_get_nearby_businesses_success(google_service):
         assert result[0]['rating'] == 4.5
 
 
+@pytest.mark.asyncio
+async def test_aget_nearby_businesses_runs_sync_lookup(google_service):
+    """Test async nearby lookup delegates to the sync implementation"""
+    expected = [{'name': 'Starbucks', 'rating': 4.5, 'distance_miles': 0.1}]
+    with patch.object(google_service, 'get_nearby_businesses', return_value=expected) as mock_get:
+        result = await google_service.aget_nearby_businesses(
+            lat=43.6532,
+            lng=-79.3832,
+            business_type="cafe",
+            radius=2000
+        )
+
+    assert result == expected
+    mock_get.assert_called_once_with(43.6532, -79.3832, "cafe", 2000)
+
+
+def test_get_nearby_businesses_uses_cache(google_service):
+    """Test repeat lookups on the same ~100m grid cell reuse the Places response"""
+    with patch('googlemaps.Client') as mock_client_class:
+        mock_client = MagicMock()
+        mock_client_class.return_value = mock_client
+        mock_client.places_nearby.return_value = {
+            'results': [
+                {
+                    'name': 'Starbucks',
+                    'types': ['cafe'],
+                    'rating': 4.5,
+                    'geometry': {'location': {'lat': 43.6540, 'lng': -79.3840}}
+                }
+            ]
+        }
+
+        first = google_service.get_nearby_businesses(43.6532, -79.3832, "cafe", 2000)
+        second = google_service.get_nearby_businesses(43.65321, -79.38319, "cafe", 2000)
+
+    assert mock_client.places_nearby.call_count == 1
+    assert first[0]['name'] == second[0]['name'] == 'Starbucks'
+
+
 def test_analyze_market_density(google_service):
     """Test market density analysis"""
     businesses = [
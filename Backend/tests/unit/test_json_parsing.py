@@ -0,0 +1,47 @@
+"""
+Unit tests for LLM JSON extraction helpers
+"""
+import json
+
+from app.agents.json_parsing import extract_json_span, iter_json_objects
+
+
+def test_extract_json_span_with_surrounding_prose():
+    """Test object is extracted from prose and trailing text"""
+    text = 'Here you go: {"a": 1, "b": {"c": 2}} Let me know {if} you need more.'
+
+    span = extract_json_span(text)
+
+    assert json.loads(span) == {"a": 1, "b": {"c": 2}}
+
+
+def test_extract_json_span_ignores_braces_in_strings():
+    """Test braces and escaped quotes inside strings do not affect depth"""
+    text = '{"text": "a } brace and a \\"quoted {\\" word", "n": 1}'
+
+    span = extract_json_span(text)
+
+    assert span == text
+    assert json.loads(span)["n"] == 1
+
+
+def test_extract_json_span_escaped_backslash_before_quote():
+    """Test an escaped backslash does not swallow the closing quote"""
+    text = r'{"path": "C:\\", "brace": "}"} trailing'
+
+    span = extract_json_span(text)
+
+    assert json.loads(span) == {"path": "C:\\", "brace": "}"}
+
+
+def test_extract_json_span_unbalanced_returns_none():
+    """Test truncated or missing objects return None"""
+    assert extract_json_span('{"recommendations": [{"title": "x"}') is None
+    assert extract_json_span("no json here") is None
+
+
+def test_iter_json_objects_skips_prose_braces_and_yields_nested():
+    """Test invalid {...} prose is skipped and nested objects follow their parent"""
+    text = 'Note {if} needed: ```json\n{"result": {"score": 7}}\n``` done'
+
+    assert list(iter_json_objects(text)) == [{"result": {"score": 7}}, {"score": 7}]
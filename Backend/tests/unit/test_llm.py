@@ -0,0 +1,56 @@
+"""
+Unit tests for shared LLM call helpers
+"""
+import asyncio
+from contextlib import aclosing
+from unittest.mock import patch
+
+import pytest
+
+from app.agents import llm as llm_module
+from app.agents.llm import astream_with_retry
+
+
+class _FakeStreamingLLM:
+    """Streams fixed chunks, optionally failing the first attempts with a 429"""
+
+    def __init__(self, chunks, rate_limited_attempts=0):
+        self.chunks = chunks
+        self.rate_limited_attempts = rate_limited_attempts
+        self.calls = 0
+        self.closed = False
+
+    async def astream(self, messages):
+        self.calls += 1
+        if self.calls <= self.rate_limited_attempts:
+            raise RuntimeError("429 RESOURCE_EXHAUSTED")
+        try:
+            for chunk in self.chunks:
+                yield chunk
+        finally:
+            self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_astream_with_retry_closes_upstream_when_stopped_early():
+    """Test breaking out of the stream closes the underlying LLM stream"""
+    fake = _FakeStreamingLLM(['a', 'b', 'c'])
+
+    async with aclosing(astream_with_retry(fake, [], asyncio.Semaphore(1))) as stream:
+        async for chunk in stream:
+            break
+
+    assert chunk == 'a'
+    assert fake.closed
+
+
+@pytest.mark.asyncio
+async def test_astream_with_retry_retries_rate_limit_before_first_chunk():
+    """Test a 429 raised before any chunk is retried"""
+    fake = _FakeStreamingLLM(['a', 'b'], rate_limited_attempts=1)
+
+    with patch.object(llm_module, '_RETRY_BASE_DELAY', 0.0):
+        chunks = [chunk async for chunk in astream_with_retry(fake, [], asyncio.Semaphore(1), max_attempts=2)]
+
+    assert chunks == ['a', 'b']
+    assert fake.calls == 2
@@ -199,3 +199,160 @@ async def test_orchestrator_parallel_execution():
 
     # Risk should run after both complete
     assert risk_idx > max(financial_end_idx, market_end_idx)
+
+
+@pytest.mark.asyncio
+async def test_run_assessments_preserves_order():
+    """Test batch assessments run through run_assessment and keep input order"""
+    orchestrator = Orchestrator()
+
+    async def fake_run_assessment(**kwargs):
+        return {'success': True, 'application_id': kwargs['application_id']}
+
+    orchestrator.run_assessment = AsyncMock(side_effect=fake_run_assessment)
+
+    applications = [{'application_id': f'app-{i}'} for i in range(5)]
+    results = await orchestrator.run_assessments(applications, max_concurrency=2)
+
+    assert [r['application_id'] for r in results] == [f'app-{i}' for i in range(5)]
+    assert orchestrator.run_assessment.await_count == 5
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_market_timeout_uses_default():
+    """Test a hung market agent falls back to default market results"""
+    import asyncio
+    from app.agents.orchestrator import orchestrator as orchestrator_module
+
+    orchestrator = Orchestrator()
+
+    async def hung_market(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    orchestrator.financial_analyst.analyze = AsyncMock(return_value={'success': True})
+    orchestrator.market_researcher.analyze = hung_market
+    orchestrator.risk_assessor.assess = AsyncMock(return_value={'success': True, 'eligibility': 'review'})
+    orchestrator.coach.generate_recommendations = AsyncMock(return_value=[])
+
+    with patch.object(orchestrator_module.settings, 'MARKET_AGENT_TIMEOUT_SECONDS', 0.01):
+        result = await orchestrator.run_assessment(
+            application_id='test-123',
+            access_token='fake-token',
+            user_job='Coffee shop owner',
+            user_age=35,
+            location_lat=43.6532,
+            location_lng=-79.3832,
+            loan_amount=50000.0,
+            loan_purpose='Equipment'
+        )
+
+    assert result['success'] is True
+    assert result['market_analysis']['success'] is False
+    assert result['financial_metrics']['success'] is True
+
+
+@pytest.mark.asyncio
+async def test_run_assessment_streaming_emits_decision_before_recommendations():
+    """Test the decision is emitted before Coach recommendations arrive"""
+    orchestrator = Orchestrator()
+
+    orchestrator.financial_analyst.analyze = AsyncMock(return_value={'success': True})
+    orchestrator.market_researcher.analyze = AsyncMock(return_value={'success': True})
+    orchestrator.risk_assessor.assess = AsyncMock(return_value={'success': True, 'eligibility': 'approved'})
+    orchestrator.coach.generate_recommendations = AsyncMock(return_value=[{'title': 'Build savings'}])
+
+    events = []
+    async for event in orchestrator.run_assessment_streaming(
+        application_id='test-123',
+        access_token='fake-token',
+        user_job='Coffee shop owner',
+        user_age=35,
+        location_lat=43.6532,
+        location_lng=-79.3832,
+        loan_amount=50000.0,
+        loan_purpose='Equipment'
+    ):
+        events.append((event['event'], list(event['data']['recommendations'])
+                       if event['event'] == 'assessment' else event['data']))
+
+    assert events == [
+        ('assessment', []),
+        ('recommendations', [{'title': 'Build savings'}]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_assessment_streaming_cancels_coach_when_closed_early():
+    """Test closing the stream after the decision cancels the pending Coach call"""
+    import asyncio
+
+    orchestrator = Orchestrator()
+
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def hung_coach(**kwargs):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    orchestrator.financial_analyst.analyze = AsyncMock(return_value={'success': True})
+    orchestrator.market_researcher.analyze = AsyncMock(return_value={'success': True})
+    orchestrator.risk_assessor.assess = AsyncMock(return_value={'success': True, 'eligibility': 'approved'})
+    orchestrator.coach.generate_recommendations = hung_coach
+
+    stream = orchestrator.run_assessment_streaming(
+        application_id='test-123',
+        access_token='fake-token',
+        user_job='Coffee shop owner',
+        user_age=35,
+        location_lat=43.6532,
+        location_lng=-79.3832,
+        loan_amount=50000.0,
+        loan_purpose='Equipment'
+    )
+    first = await stream.__anext__()
+    await asyncio.wait_for(started.wait(), timeout=1)
+    await stream.aclose()
+
+    assert first['event'] == 'assessment'
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_assessments_share_one_run():
+    """Test duplicate in-flight requests reuse the first pipeline run"""
+    import asyncio
+
+    orchestrator = Orchestrator()
+
+    async def slow_financial(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return {'success': True}
+
+    orchestrator.financial_analyst.analyze = AsyncMock(side_effect=slow_financial)
+    orchestrator.market_researcher.analyze = AsyncMock(return_value={'success': True})
+    orchestrator.risk_assessor.assess = AsyncMock(return_value={'success': True, 'eligibility': 'review'})
+    orchestrator.coach.generate_recommendations = AsyncMock(return_value=[])
+
+    application = dict(
+        application_id='test-123',
+        access_token='fake-token',
+        user_job='Coffee shop owner',
+        user_age=35,
+        location_lat=43.6532,
+        location_lng=-79.3832,
+        loan_amount=50000.0,
+        loan_purpose='Equipment'
+    )
+    first, second = await asyncio.gather(
+        orchestrator.run_assessment(**application),
+        orchestrator.run_assessment(**application)
+    )
+
+    assert first is second
+    assert orchestrator.financial_analyst.analyze.await_count == 1
+    assert orchestrator._inflight == {}
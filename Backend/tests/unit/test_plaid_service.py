@@ -1,12 +1,14 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from app.services.plaid_service import PlaidService
+from app.services.plaid_service import PlaidService, _transactions_cache, _balance_cache
 from datetime import datetime, timedelta
 
 
 @pytest.fixture
 def plaid_service():
     """Create PlaidService instance"""
+    _transactions_cache.clear()
+    _balance_cache.clear()
     return PlaidService()
 
 
@@ -37,6 +39,16 @@ def test_exchange_public_token_success(plaid_service):
         assert result == "access-sandbox-123"
 
 
+@pytest.mark.asyncio
+async def test_aexchange_public_token_runs_sync_exchange(plaid_service):
+    """Test async token exchange delegates to the sync implementation"""
+    with patch.object(plaid_service, 'exchange_public_token', return_value='access-sandbox-123') as mock_exchange:
+        result = await plaid_service.aexchange_public_token("public-sandbox-123")
+
+    assert result == "access-sandbox-123"
+    mock_exchange.assert_called_once_with("public-sandbox-123")
+
+
 def test_get_transactions_success(plaid_service):
     """Test successful transaction retrieval"""
     with patch('plaid.ApiClient') as mock_client, \
@@ -100,6 +112,21 @@ def test_get_balance_success(plaid_service):
         assert len(result['accounts']) == 1
 
 
+def test_get_balance_uses_cache(plaid_service):
+    """Test repeat balance lookups for the same access token reuse the Plaid response"""
+    mock_api_instance = MagicMock()
+    mock_api_instance.accounts_balance_get.return_value = Mock(accounts=[
+        Mock(account_id='acc1', balances=Mock(current=1000.0))
+    ])
+    plaid_service.client = mock_api_instance
+
+    first = plaid_service.get_balance("access-sandbox-123")
+    second = plaid_service.get_balance("access-sandbox-123")
+
+    assert mock_api_instance.accounts_balance_get.call_count == 1
+    assert first == second == {'accounts': [{'account_id': 'acc1', 'balances': {'current': 1000.0}}]}
+
+
 def test_get_income_success(plaid_service):
     """Test successful income retrieval"""
     with patch('plaid.ApiClient') as mock_client, \
@@ -99,6 +99,9 @@ export function RunEvaluationStep({
         await new Promise(resolve => setTimeout(resolve, 2000));
 
         const statusResponse = await api.getApplicationStatus(applicationId);
+        if (statusResponse.success && statusResponse.data.status === 'failed') {
+          throw new Error('Assessment failed - please try again');
+        }
         if (statusResponse.success && statusResponse.data.has_results) {
           assessmentComplete = true;
         }